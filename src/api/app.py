@@ -7,7 +7,7 @@ from litestar.template.config import TemplateConfig
 
 from appkit.manager import ApplicationManager
 
-from .routes import app_config_page, app_list, update_config
+from .routes import app_config_page, app_list, frame_stats, http_stats, update_config
 
 
 async def after_exception_handler(
@@ -19,7 +19,13 @@ async def after_exception_handler(
 def create_app(apps_dir: Path, templates_dir: Path, state: Dict[str, Any]) -> Litestar:
     app = Litestar(
         after_exception=[after_exception_handler],
-        route_handlers=[app_list, app_config_page, update_config],
+        route_handlers=[
+            app_list,
+            app_config_page,
+            frame_stats,
+            http_stats,
+            update_config,
+        ],
         template_config=TemplateConfig(
             directory=templates_dir, engine=JinjaTemplateEngine
         ),
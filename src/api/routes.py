@@ -11,6 +11,7 @@ from litestar.response import Redirect, Template
 
 from appkit.base import ApplicationConfig
 from appkit.config import Config
+from appkit.http_client import shared_http_client
 from appkit.manager import ApplicationManager
 from appkit.validation import ConfigValidator
 
@@ -67,6 +68,17 @@ async def app_config_page(app_name: str, request: Request) -> Template:
         raise
 
 
+@get("/stats")
+async def frame_stats(request: Request) -> Dict[str, Any]:
+    os_instance = request.app.state.os_instance
+    return os_instance.get_frame_stats()
+
+
+@get("/stats/http")
+async def http_stats() -> Dict[str, Any]:
+    return shared_http_client().get_stats()
+
+
 @post("/applications/{app_name:str}/config")
 async def update_config(app_name: str, request: Request) -> Redirect:
     manager: ApplicationManager = request.app.state.app_manager
@@ -9,6 +9,8 @@ from PIL import Image
 from tfeos.input import InputResult, InputType
 
 from .config import Config
+from .fetch_loop import FetchLoop, shared_fetch_loop
+from .http_client import HttpClient, shared_http_client
 
 
 class ApplicationConfig:
@@ -19,6 +21,16 @@ class ApplicationConfig:
         self.config = self._load_config()
         self.app_name: str = self.metadata["name"]
 
+    @property
+    def http(self) -> HttpClient:
+        """Pooled HTTP client shared by all applications"""
+        return shared_http_client()
+
+    @property
+    def fetch_loop(self) -> FetchLoop:
+        """Event loop that runs every application's periodic fetch jobs"""
+        return shared_fetch_loop()
+
     def _load_metadata(self) -> Dict[str, Any]:
         with open(self.app_dir / "metadata.json") as f:
             return json.load(f)
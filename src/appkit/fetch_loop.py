@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FetchJob:
+    """A periodic fetch running as a task on the FetchLoop.
+
+    `fetch` runs on one of the loop's worker threads, so it may block on the
+    network. It can return the number of seconds to wait before the next run,
+    or None to use `interval`. If it raises, the job tries again after
+    `retry_interval`.
+    """
+
+    def __init__(
+        self,
+        fetch_loop: "FetchLoop",
+        name: str,
+        fetch: Callable[[], Optional[float]],
+        interval: float,
+        retry_interval: float,
+        delay: float = 0,
+    ):
+        self.fetch_loop = fetch_loop
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.delay = delay
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def wake(self):
+        """Run the fetch now instead of waiting out the current interval"""
+        self.fetch_loop.call_soon(self._wake.set)
+
+    def cancel(self):
+        self._cancelled = True
+        self.fetch_loop.call_soon(self._cancel)
+
+    def _start(self):
+        if not self._cancelled:
+            self.fetch_loop.jobs.add(self)
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name=self.name
+            )
+
+    def _cancel(self):
+        if self._task:
+            self._task.cancel()
+        self.fetch_loop.jobs.discard(self)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        if self.delay > 0:
+            await self._sleep(self.delay)
+
+        while True:
+            try:
+                wait = await loop.run_in_executor(self.fetch_loop.executor, self.fetch)
+                if wait is None:
+                    wait = self.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.name} failed: {e}")
+                wait = self.retry_interval
+
+            await self._sleep(wait)
+
+    async def _sleep(self, seconds: float):
+        """Wait for `seconds`, or until woken"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), seconds)
+        except TimeoutError:
+            pass
+        self._wake.clear()
+
+
+class FetchLoop:
+    """One asyncio event loop thread that runs every application's fetch jobs.
+
+    Blocking fetches are handed to a fixed pool of worker threads, so jobs
+    from the same app run concurrently while the number of threads stays the
+    same however many times apps are launched and closed. Apps cancel their
+    jobs in cleanup().
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="FetchWorker"
+        )
+        self.jobs: Set[FetchJob] = set()  # Only changed on the loop thread.
+        self._batches: Set[asyncio.Task] = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread: Optional[Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = Thread(
+            target=self._loop.run_forever, daemon=True, name="FetchLoop"
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        """Cancel every job and stop the loop thread"""
+        if not self._thread:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            logger.warning(f"Fetch jobs did not stop cleanly: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def schedule(
+        self,
+        name: str,
+        fetch: Callable[[], Optional[float]],
+        interval: float,
+        retry_interval: float = 30,
+        delay: float = 0,
+    ) -> FetchJob:
+        """Run `fetch` after `delay` seconds (straight away by default) and then every `interval` seconds"""
+        job = FetchJob(self, name, fetch, interval, retry_interval, delay)
+        self.call_soon(job._start)
+        return job
+
+    def submit(self, fetch: Callable[..., Any], *args) -> Future:
+        """Run a one-off fetch on the worker pool, e.g. right after a config change"""
+        return self.executor.submit(fetch, *args)
+
+    def run_batch(
+        self, calls: List[Tuple[Callable[..., Any], tuple]], limit: int
+    ) -> List[Any]:
+        """Run (fetch, args) calls on the worker pool, at most `limit` at a time.
+
+        Blocks until every call is done and returns their results in order,
+        with the exception in place of any call that raised. Meant to be
+        called from a fetch, never from the loop thread itself.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._run_batch(calls, limit), self._loop
+        ).result()
+
+    def call_soon(self, callback: Callable[[], None]):
+        self._loop.call_soon_threadsafe(callback)
+
+    def get_stats(self) -> dict:
+        return {"jobs": sorted(job.name for job in list(self.jobs))}
+
+    async def _run_batch(self, calls, limit: int) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(fetch, args):
+            async with semaphore:
+                return await loop.run_in_executor(self.executor, fetch, *args)
+
+        task = asyncio.current_task()
+        self._batches.add(task)
+        try:
+            return await asyncio.gather(
+                *(run(fetch, args) for fetch, args in calls), return_exceptions=True
+            )
+        finally:
+            self._batches.discard(task)
+
+    async def _cancel_all(self):
+        tasks = [job._task for job in self.jobs if job._task]
+        # Batches are cancelled too, so the fetches waiting on them return.
+        for task in list(self._batches):
+            task.cancel()
+        for job in list(self.jobs):
+            job._cancelled = True
+            job._cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_shared_loop: Optional[FetchLoop] = None
+_shared_lock = Lock()
+
+
+def shared_fetch_loop() -> FetchLoop:
+    """The process-wide fetch loop, started on first use"""
+    global _shared_loop
+    with _shared_lock:
+        if _shared_loop is None:
+            _shared_loop = FetchLoop()
+            _shared_loop.start()
+        return _shared_loop
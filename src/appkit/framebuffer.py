@@ -0,0 +1,130 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from .graphics_helpers import blit_image
+
+ColorTuple = Tuple[int, int, int]
+
+
+class FrameBuffer:
+    """Whole-frame drawing surface backed by a (height, width, 3) uint8 array.
+
+    Pixels live in an RGBX buffer so PIL can wrap the same memory without a
+    copy; `pixels` is the (height, width, 3) view apps should do array math on.
+    """
+
+    def __init__(self, width: int = 64, height: int = 32):
+        self.width = width
+        self.height = height
+        self.buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        self.pixels = self.buffer[:, :, :3]
+        self._image = Image.frombuffer(
+            "RGBX", (width, height), self.buffer, "raw", "RGBX", 0, 1
+        )
+
+    def clear(self):
+        self.buffer.fill(0)
+
+    def fill(
+        self,
+        color: ColorTuple,
+        x: int = 0,
+        y: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ):
+        """Fill a rectangle (the whole frame by default) with a solid colour"""
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        area = self._clip(x, y, width, height)
+        if area:
+            dst, _ = area
+            self.pixels[dst] = color
+
+    def blit(self, source: np.ndarray, x: int = 0, y: int = 0):
+        """Copy an (h, w, 3) array onto the frame, or blend it if it has an alpha channel"""
+        if source.shape[2] == 4:
+            self.blend(source[:, :, :3], x, y, source[:, :, 3] / 255.0)
+            return
+
+        area = self._clip(x, y, source.shape[1], source.shape[0])
+        if area:
+            dst, src = area
+            self.pixels[dst] = source[src]
+
+    def blend(
+        self,
+        source: np.ndarray,
+        x: int = 0,
+        y: int = 0,
+        alpha: Union[float, np.ndarray] = 0.5,
+    ):
+        """Alpha-blend an (h, w, 3) array over the frame.
+
+        `alpha` is either a single opacity or an (h, w) array of per-pixel
+        opacities, both in the range 0.0 - 1.0.
+        """
+        area = self._clip(x, y, source.shape[1], source.shape[0])
+        if not area:
+            return
+        dst, src = area
+
+        if isinstance(alpha, np.ndarray):
+            alpha = alpha[src][:, :, np.newaxis]
+        under = self.pixels[dst].astype(np.float32)
+        over = source[src].astype(np.float32)
+        self.pixels[dst] = (under + (over - under) * alpha + 0.5).astype(np.uint8)
+
+    def gradient(
+        self,
+        start: ColorTuple,
+        end: ColorTuple,
+        vertical: bool = False,
+        x: int = 0,
+        y: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ):
+        """Fill a rectangle with a linear gradient from `start` to `end`"""
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        steps = height if vertical else width
+
+        t = np.linspace(0.0, 1.0, steps, dtype=np.float32)[:, np.newaxis]
+        start_arr = np.array(start, dtype=np.float32)
+        end_arr = np.array(end, dtype=np.float32)
+        ramp = (start_arr + (end_arr - start_arr) * t + 0.5).astype(np.uint8)
+
+        if vertical:
+            strip = np.broadcast_to(ramp[:, np.newaxis, :], (height, width, 3))
+        else:
+            strip = np.broadcast_to(ramp[np.newaxis, :, :], (height, width, 3))
+        self.blit(strip, x, y)
+
+    def paste_image(self, image: Image.Image, x: int = 0, y: int = 0):
+        """Draw a PIL image onto the frame, honouring transparency for RGBA images"""
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        self.blit(np.asarray(image), x, y)
+
+    def to_image(self) -> Image.Image:
+        """Read-only RGBX PIL view that shares memory with the frame"""
+        return self._image
+
+    def flush(self, canvas, x: int = 0, y: int = 0):
+        """Push the whole frame to a matrix canvas in one call"""
+        blit_image(canvas, self._image.convert("RGB"), x, y)
+
+    def _clip(
+        self, x: int, y: int, width: int, height: int
+    ) -> Optional[Tuple[Tuple[slice, slice], Tuple[slice, slice]]]:
+        """Return (frame, source) slices for a rectangle clipped to the frame"""
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        dst = (slice(y0, y1), slice(x0, x1))
+        src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        return dst, src
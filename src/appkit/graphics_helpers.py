@@ -1,7 +1,10 @@
+import logging
 from PIL import Image, ImageDraw, ImageFont
 from enum import Enum
 from typing import Dict, List, Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class Region(Enum):
     LEFT = 1
@@ -10,9 +13,15 @@ class Region(Enum):
     FULL = 4
 
 
+class BlitMode(Enum):
+    BULK = 1
+    PIXEL = 2
+
+
 class MatrixCanvas:
-    def __init__(self):
+    def __init__(self, blit_mode: BlitMode = BlitMode.BULK):
         self.last_frame = None
+        self.blit_mode = blit_mode
         self.sub_images = {
             Region.LEFT: Image.new("RGB", (40, 30)),
             Region.CENTRE: Image.new("RGB", (20, 30)),
@@ -167,6 +176,23 @@ class MatrixCanvas:
         tmp_img = tmp_img.rotate(90, expand=True)
         self.draw_image(region, x, y, tmp_img)
 
+    def draw_data_age(
+        self,
+        region: Region,
+        age_text: str,
+        color,
+        font: ImageFont.ImageFont,
+    ):
+        """Draw a data age label on a black box in the bottom right corner"""
+        bbox = self.draw_regions[region].textbbox((0, 0), age_text, font=font)
+        x = self.sub_images[region].width - (bbox[2] - bbox[0]) - 1
+        y = self.sub_images[region].height - bbox[3]
+        self.draw_regions[region].rectangle(
+            [(x - 1, y + bbox[1] - 1), (self.sub_images[region].width, y + bbox[3])],
+            fill=(0, 0, 0),
+        )
+        self.draw_text(region, x, y, age_text, color, font)
+
     def clear_region(self, region: Region, color=(0, 0, 0)):
         """Clear a region to specified color"""
         self.draw_regions[region].rectangle(
@@ -179,6 +205,10 @@ class MatrixCanvas:
 
     def render_frame(self, canvas):
         image_rgb = self.sub_images[Region.FULL]
+        if self.blit_mode == BlitMode.BULK:
+            blit_image(canvas, image_rgb)
+            return
+
         for y in range(min(self.sub_images[Region.FULL].height, 32)):
             for x in range(min(self.sub_images[Region.FULL].width, 64)):
                 r, g, b = image_rgb.getpixel((x, y))
@@ -192,6 +222,46 @@ class MatrixCanvas:
         self.draw_regions[region].rectangle([(0, 0), (width, height)], fill=(0, 0, 0))
 
 
+# Canvas types whose SetImage is missing or unusable with the installed Pillow
+_no_set_image = set()
+
+
+def blit_image(canvas, image: Image.Image, x: int = 0, y: int = 0):
+    """Copy an RGB image onto a matrix canvas in one call.
+
+    Uses the canvas' native SetImage where available, otherwise walks the raw
+    image bytes once instead of calling getpixel for every pixel.
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    canvas_type = type(canvas)
+    if canvas_type not in _no_set_image and hasattr(canvas, "SetImage"):
+        try:
+            canvas.SetImage(image, x, y)
+            return
+        except (AttributeError, TypeError) as e:
+            # Older rgbmatrix bindings rely on Pillow internals that are gone
+            logger.warning(f"SetImage unavailable on {canvas_type.__name__}: {e}")
+            _no_set_image.add(canvas_type)
+
+    set_pixels_from_bytes(canvas, image.tobytes(), image.width, image.height, x, y)
+
+
+def set_pixels_from_bytes(
+    canvas, data: bytes, width: int, height: int, x: int = 0, y: int = 0
+):
+    """Write packed RGB bytes to the canvas, clipped to the 64x32 panel"""
+    set_pixel = canvas.SetPixel
+    x_start = max(0, -x)
+    x_end = min(width, 64 - x)
+    for row in range(max(0, -y), min(height, 32 - y)):
+        offset = row * width * 3
+        for col in range(x_start, x_end):
+            i = offset + col * 3
+            set_pixel(x + col, y + row, data[i], data[i + 1], data[i + 2])
+
+
 def crop_image(image: Image.Image) -> Image.Image:
     """Crop transparent pixels from image"""
     if image.mode != "RGBA":
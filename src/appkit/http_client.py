@@ -0,0 +1,118 @@
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds, used when a caller doesn't pass one.
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class HostStats:
+    """Request counters and latency for one host"""
+
+    __slots__ = ("requests", "errors", "total_latency", "max_latency", "last_latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def record(self, latency: float, failed: bool):
+        self.requests += 1
+        if failed:
+            self.errors += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1)
+            if self.requests
+            else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+            "last_latency_ms": round(self.last_latency * 1000, 1),
+        }
+
+
+class HttpClient:
+    """One pooled HTTP session shared by every application.
+
+    Connections are kept alive and pooled per host, so repeated calls to the
+    same API skip the TCP and TLS handshakes. Idempotent requests are retried
+    with exponential backoff on connection errors and on 429/5xx responses,
+    and every request gets a timeout unless the caller passes its own.
+    """
+
+    def __init__(self, pool_hosts: int = 16, pool_size: int = 8, retries: int = 3):
+        retry_strategy = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,  # Hand the last response back, callers check status.
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_size,
+            max_retries=retry_strategy,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = Lock()
+        self._stats: Dict[str, HostStats] = {}
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        host = urlsplit(url).netloc
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(method, url, **kwargs)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            self._record(host, time.perf_counter() - start, failed)
+
+    def _record(self, host: str, latency: float, failed: bool):
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = HostStats()
+            stats.record(latency, failed)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts and latencies since startup"""
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = Lock()
+
+
+def shared_http_client() -> HttpClient:
+    """The process-wide client, created on first use"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -1,12 +1,14 @@
-import base64
 import logging
 from io import BytesIO
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
 
 from tfeos.input import InputType
 
 from .base import Scene
-from .graphics_helpers import Color
+from .framebuffer import FrameBuffer
 
 logger = logging.getLogger("tfeos.menu")
 
@@ -19,11 +21,31 @@ class AppMenuItem:
 
 
 class AppMenuScene(Scene):
+    placeholder_colour = (64, 64, 64)
+    selection_colour = (255, 255, 0)
+    page_colour = (255, 255, 255)
+    other_page_colour = (64, 64, 64)
+
     def __init__(self, apps: List[AppMenuItem]):
-        self.apps = apps
         self.selected_index = 0
         self.icon_size = 16
         self.gap = 1
+        self.frame = FrameBuffer()
+        self.icon_cache: Dict[str, Optional[np.ndarray]] = {}
+        self.pages: Optional[List[np.ndarray]] = None
+        self.apps = apps
+
+    @property
+    def apps(self) -> List[AppMenuItem]:
+        return self._apps
+
+    @apps.setter
+    def apps(self, apps: List[AppMenuItem]):
+        """Replace the app list, dropping the cached icons and pages so they rebuild"""
+        self._apps = apps
+        self.icon_cache.clear()
+        self.pages = None
+        self.selected_index = min(self.selected_index, max(len(apps) - 1, 0))
 
     @property
     def current_page(self) -> int:
@@ -40,68 +62,67 @@ class AppMenuScene(Scene):
         return (pos // 3, pos % 3)
 
     def render(self, canvas) -> None:
-        # canvas.Clear()
-
-        start_idx = self.current_page * 6
-        end_idx = min(start_idx + 6, len(self.apps))
-        page_apps = self.apps[start_idx:end_idx]
-
-        for idx, app in enumerate(page_apps):
-            row = idx // 3
-            col = idx % 3
-
-            x = col * (self.icon_size + self.gap)
-            y = row * (self.icon_size)
-
-            global_idx = start_idx + idx
-            is_selected = global_idx == self.selected_index
-
+        if self.pages is None:
+            self._build_pages()
+
+        if self.pages:
+            self.frame.pixels[...] = self.pages[self.current_page]
+        else:
+            self.frame.clear()
+
+        if self.selected_index < len(self.apps):
+            row, col = self.position_on_page
+            self._draw_border(
+                self.frame.pixels,
+                col * (self.icon_size + self.gap),
+                row * self.icon_size,
+                self.selection_colour,
+            )
+
+        self.frame.flush(canvas)
+
+    def _build_pages(self):
+        """Composite every page's icons and page indicator into one bitmap each"""
+        self.pages = []
+        for page in range(self.total_pages):
+            pixels = np.zeros((32, 64, 3), dtype=np.uint8)
+            start_idx = page * 6
+            for idx, app in enumerate(self.apps[start_idx : start_idx + 6]):
+                x = (idx % 3) * (self.icon_size + self.gap)
+                y = (idx // 3) * self.icon_size
+
+                icon = self._get_icon(app)
+                if icon is not None:
+                    pixels[y : y + self.icon_size, x : x + self.icon_size] = icon
+                else:
+                    self._draw_border(pixels, x, y, self.placeholder_colour)
+
+            self._draw_page_indicator(pixels, page)
+            self.pages.append(pixels)
+
+    def _get_icon(self, app: AppMenuItem) -> Optional[np.ndarray]:
+        """Decode and scale an app icon once, caching the resulting pixels"""
+        if app.name not in self.icon_cache:
+            icon = None
             if app.icon_data:
-                self._draw_icon(canvas, x, y, app.icon_data)
-            else:
-                self._draw_placeholder(canvas, x, y)
-
-            if is_selected:
-                self._draw_selection_border(canvas, x, y)
-
-        self._draw_page_indicator(canvas)
-
-    def _draw_icon(self, canvas, x: int, y: int, icon_data: bytes):
-        try:
-            from PIL import Image
-
-            icon = Image.open(BytesIO(icon_data))
-            icon = icon.convert("RGB")
-            icon = icon.resize((self.icon_size, self.icon_size))
-
-            for py in range(self.icon_size):
-                for px in range(self.icon_size):
-                    r, g, b = icon.getpixel((px, py))
-                    canvas.SetPixel(x + px, y + py, r, g, b)
-        except Exception:
-            self._draw_placeholder(canvas, x, y)
-
-    def _draw_placeholder(self, canvas, x: int, y: int):
-        color = Color(64, 64, 64)
-        for py in range(self.icon_size):
-            for px in range(self.icon_size):
-                if (
-                    px == 0
-                    or px == self.icon_size - 1
-                    or py == 0
-                    or py == self.icon_size - 1
-                ):
-                    canvas.SetPixel(x + px, y + py, color.r, color.g, color.b)
-
-    def _draw_selection_border(self, canvas, x: int, y: int):
-        color = Color(255, 255, 0)
-        for i in range(self.icon_size):
-            canvas.SetPixel(x + i, y, color.r, color.g, color.b)
-            canvas.SetPixel(x + i, y + self.icon_size - 1, color.r, color.g, color.b)
-            canvas.SetPixel(x, y + i, color.r, color.g, color.b)
-            canvas.SetPixel(x + self.icon_size - 1, y + i, color.r, color.g, color.b)
-
-    def _draw_page_indicator(self, canvas):
+                try:
+                    image = Image.open(BytesIO(app.icon_data))
+                    image = image.convert("RGB")
+                    image = image.resize((self.icon_size, self.icon_size))
+                    icon = np.asarray(image, dtype=np.uint8)
+                except Exception:
+                    logger.warning(f"Could not decode icon for {app.name}")
+            self.icon_cache[app.name] = icon
+        return self.icon_cache[app.name]
+
+    def _draw_border(self, pixels: np.ndarray, x: int, y: int, colour):
+        size = self.icon_size
+        pixels[y, x : x + size] = colour
+        pixels[y + size - 1, x : x + size] = colour
+        pixels[y : y + size, x] = colour
+        pixels[y : y + size, x + size - 1] = colour
+
+    def _draw_page_indicator(self, pixels: np.ndarray, current_page: int):
         indicator_x = 63
         indicator_size = 4
         total_height = self.total_pages * indicator_size + (self.total_pages - 1)
@@ -110,20 +131,15 @@ class AppMenuScene(Scene):
         for page in range(self.total_pages):
             y = start_y + page * (indicator_size + 1)
 
-            if page == self.current_page:
-                color = Color(255, 255, 255)
+            if page == current_page:
+                colour = self.page_colour
             else:
-                color = Color(64, 64, 64)
-
-            for py in range(indicator_size):
-                for px in range(indicator_size):
-                    canvas.SetPixel(
-                        indicator_x - indicator_size + px,
-                        y + py,
-                        color.r,
-                        color.g,
-                        color.b,
-                    )
+                colour = self.other_page_colour
+
+            pixels[
+                y : y + indicator_size,
+                indicator_x - indicator_size : indicator_x,
+            ] = colour
 
     def handle_input(self, input_type: InputType) -> Optional[str]:
         """Handle input to select app, returning app name if selected, or None otherwise"""
@@ -0,0 +1,132 @@
+import time
+from typing import Any, Callable, Optional, Tuple, Union
+
+from .fetch_loop import FetchJob, FetchLoop, shared_fetch_loop
+from .store import ResponseStore
+
+
+class Snapshot:
+    """A fetched result and the time it was fetched"""
+
+    __slots__ = ("data", "fetched_at")
+
+    def __init__(self, data: Any, fetched_at: float):
+        self.data = data
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def age_label(self) -> str:
+        """Compact age for small panels, e.g. 45s, 12m, 3h, 2d"""
+        age = int(self.age)
+        if age < 60:
+            return f"{age}s"
+        if age < 3600:
+            return f"{age // 60}m"
+        if age < 86400:
+            return f"{age // 3600}h"
+        return f"{age // 86400}d"
+
+
+class DataRefresher:
+    """Runs a fetch function as a job on the shared FetchLoop and keeps the last good result.
+
+    Scenes read `snapshot` from the render path, which never blocks on the
+    network. A new snapshot replaces the old one in a single reference swap, and
+    a failed fetch leaves the previous snapshot in place.
+
+    `interval` is either a fixed number of seconds or a function that plans the
+    wait before the next refresh from the data just fetched.
+
+    With a `store`, the last snapshot is loaded from disk on creation so the
+    scene has something to show straight away, and every new snapshot is
+    written back. The first refresh still runs immediately to revalidate it,
+    unless the stored snapshot is younger than `max_age`, in which case it is
+    served until it reaches that age.
+
+    `on_update` is called with the data whenever a new snapshot is published.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        interval: Union[float, Callable[[Any], float]],
+        retry_interval: float = 30,
+        store: Optional[ResponseStore] = None,
+        store_key: Tuple = (),
+        fetch_loop: Optional[FetchLoop] = None,
+        max_age: float = 0,
+        on_update: Optional[Callable[[Any], None]] = None,
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.current_interval = retry_interval if callable(interval) else interval
+        self.snapshot: Optional[Snapshot] = None
+        self.store = store
+        self.store_key = store_key or (name,)
+        self.max_age = max_age
+        self.on_update = on_update
+        self.fetch_loop = fetch_loop or shared_fetch_loop()
+        self._job: Optional[FetchJob] = None
+
+        if store:
+            stored = store.load(self.store_key)
+            if stored:
+                self.snapshot = Snapshot(*stored)
+
+    @property
+    def data(self) -> Any:
+        snapshot = self.snapshot
+        return snapshot.data if snapshot else None
+
+    @property
+    def is_stale(self) -> bool:
+        """True once the last good snapshot has missed a couple of refreshes"""
+        snapshot = self.snapshot
+        return snapshot is not None and snapshot.age > self.current_interval * 2
+
+    def start(self):
+        if self._job and not self._job.cancelled:
+            return
+        delay = 0
+        if self.max_age and self.snapshot:
+            delay = max(self.max_age - self.snapshot.age, 0)
+        self._job = self.fetch_loop.schedule(
+            self.name,
+            self._refresh,
+            interval=self.current_interval,
+            retry_interval=self.retry_interval,
+            delay=delay,
+        )
+
+    def stop(self):
+        if self._job:
+            self._job.cancel()
+            self._job = None
+
+    def refresh_now(self):
+        if self._job:
+            self._job.wake()
+
+    def _refresh(self) -> float:
+        """Fetch once and return how long to wait before the next refresh"""
+        data = self.fetch()
+        # Cached fetches hand back the same object when nothing new
+        # was downloaded; keep the original fetch time in that case
+        if self.snapshot is None or data is not self.snapshot.data:
+            self.snapshot = Snapshot(data, time.time())
+            if self.store:
+                self.store.save(self.store_key, data, self.snapshot.fetched_at)
+            if self.on_update:
+                self.on_update(data)
+        if callable(self.interval):
+            wait = self.interval(data)
+        else:
+            wait = self.interval
+        self.current_interval = wait
+        return wait
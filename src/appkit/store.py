@@ -0,0 +1,82 @@
+import dataclasses
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dataclasses that can be written to and read back from a ResponseStore, by name
+_storable_types: Dict[str, type] = {}
+
+
+def storable(cls):
+    """Class decorator letting a dataclass round-trip through a ResponseStore"""
+    _storable_types[cls.__name__] = cls
+    return cls
+
+
+def _encode(value: Any) -> Any:
+    if type(value).__name__ in _storable_types:
+        encoded = {"__type__": type(value).__name__}
+        for field in dataclasses.fields(value):
+            encoded[field.name] = getattr(value, field.name)
+        return encoded
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__}")
+
+
+def _decode(obj: dict) -> Any:
+    if "__type__" in obj:
+        cls = _storable_types[obj.pop("__type__")]
+        return cls(**obj)
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class ResponseStore:
+    """Keeps the last parsed response per endpoint on disk, under the app directory.
+
+    Each entry is a JSON file holding the data and the time it was fetched, so
+    an app can show its last known data on launch before the network answers.
+    """
+
+    def __init__(self, app_dir: Path):
+        self.directory = app_dir / "cache"
+
+    def _path(self, key: Tuple) -> Path:
+        name = "-".join(str(part) for part in key)
+        return self.directory / (re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".json")
+
+    def load(self, key: Tuple) -> Optional[Tuple[Any, float]]:
+        """Return (data, fetched_at) for a key, or None if nothing usable is stored"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f, object_hook=_decode)
+            return entry["data"], entry["fetched_at"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+    def save(self, key: Tuple, data: Any, fetched_at: float):
+        path = self._path(key)
+        try:
+            self.directory.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"fetched_at": fetched_at, "data": data}, f, default=_encode)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write cache file {path}: {e}")
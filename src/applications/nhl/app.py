@@ -28,6 +28,10 @@ class App(Application):
             self.current_scene_index = 2
         self.scene_order = ["games", "standings", "favourite"]
 
+    def cleanup(self):
+        for scene in self.scenes.values():
+            scene.cleanup()
+
     def get_framerate(self) -> int:
         return 10
 
@@ -0,0 +1,65 @@
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from appkit.graphics_helpers import crop_image
+
+logger = logging.getLogger(__name__)
+
+
+class LogoSprites:
+    """Team logos prepared for the panel once and kept ready to paste.
+
+    The RGBA source is cropped to its visible pixels, scaled to fit `size`
+    and flattened onto black. Sprites are cached in memory and under the app's
+    cache directory, named after the source file's mtime and size so an
+    updated PNG is picked up automatically.
+    """
+
+    def __init__(self, app_dir: Path, size: Tuple[int, int] = (30, 30)):
+        self.size = size
+        self.source_dir = app_dir / "resources" / "images" / "NHL" / "teams"
+        self.cache_dir = app_dir / "cache" / "logos"
+        self.sprites: Dict[str, Optional[Image.Image]] = {}
+
+    def get(self, team: str) -> Optional[Image.Image]:
+        if team not in self.sprites:
+            self.sprites[team] = self._load(team)
+        return self.sprites[team]
+
+    def _load(self, team: str) -> Optional[Image.Image]:
+        source = self.source_dir / f"{team}.png"
+        if not source.exists():
+            return None
+
+        stat = source.stat()
+        prefix = f"{team}-{self.size[0]}x{self.size[1]}-"
+        cached = self.cache_dir / f"{prefix}{stat.st_mtime_ns}-{stat.st_size}.png"
+
+        if cached.exists():
+            try:
+                with Image.open(cached) as img:
+                    return img.convert("RGB")
+            except Exception as e:
+                logger.warning(f"Rebuilding unreadable logo sprite {cached}: {e}")
+
+        sprite = self._build(source)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for old in self.cache_dir.glob(f"{prefix}*.png"):
+                old.unlink()
+            sprite.save(cached)
+        except OSError as e:
+            logger.warning(f"Could not cache logo sprite for {team}: {e}")
+        return sprite
+
+    def _build(self, source: Path) -> Image.Image:
+        with Image.open(source) as img:
+            logo = crop_image(img.convert("RGBA"))
+        logo.thumbnail(self.size)
+
+        sprite = Image.new("RGB", logo.size)
+        sprite.paste(logo, (0, 0), logo)
+        return sprite
@@ -1,26 +1,25 @@
 import math
-import threading
 import time
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw, ImageFont
 
 from appkit.base import Scene
-from appkit.graphics_helpers import Font, MatrixCanvas, Region, crop_image
+from appkit.graphics_helpers import Font, MatrixCanvas, Region
+from appkit.refresh import DataRefresher
+from appkit.store import ResponseStore
 from tfeos.input import InputResult, InputType
 
-from .nhl_api import get_next_game, get_standings
+from .assets import LogoSprites
+from .nhl_api import SEASON_SCHEDULE_TTL, get_next_game, get_season_schedule, get_standings
 
 
 class NHLFavouriteTeamScene(Scene):
     def __init__(self, application_config):
         self.config = application_config.config
         self.app_dir = application_config.app_dir
-        self.last_update = None
-        self.next_game_data = None
-        self.team_stats = None
         self.show_stats = False
 
         self.matrix_canvas = MatrixCanvas()
@@ -46,19 +45,42 @@ class NHLFavouriteTeamScene(Scene):
             "green": (28, 122, 0),
         }
 
-        self.image_cache = {}
+        self.logos = LogoSprites(self.app_dir)
+
+        store = ResponseStore(self.app_dir)
+        # A stored schedule younger than a day is used as is, and the team data
+        # is refreshed as soon as a new schedule arrives.
+        self.schedule_refresher = DataRefresher(
+            "NHLScheduleRefresher",
+            get_season_schedule,
+            interval=SEASON_SCHEDULE_TTL,
+            store=store,
+            store_key=("season_schedule",),
+            max_age=SEASON_SCHEDULE_TTL,
+            on_update=lambda schedule: self.refresher.refresh_now(),
+        )
+        self.refresher = DataRefresher(
+            "NHLFavouriteRefresher",
+            self._fetch_team_data,
+            interval=300,
+            store=store,
+            store_key=("favourite", self.config.get("favourite_team", "MTL")),
+        )
+        self.refresher.start()
+        self.schedule_refresher.start()
+
+    def cleanup(self):
+        self.schedule_refresher.stop()
+        self.refresher.stop()
 
     def render(self, canvas) -> None:
-        if not self.last_update or (datetime.now() - self.last_update).seconds > 300:
-            fav_team = self.config.get("favourite_team", "MTL")
-            self.next_game_data = get_next_game(fav_team)
-            self._get_team_stats(fav_team)
-            self.last_update = datetime.now()
+        snapshot = self.refresher.snapshot
 
-        if not self.next_game_data:
+        if not snapshot or not snapshot.data["next_game"]:
+            message = "No Data" if snapshot else "Loading..."
             self.matrix_canvas.clear_region(Region.FULL)
             self.matrix_canvas.draw_text(
-                Region.FULL, 2, 12, "No Data", self.colours["white"], self.fonts["sm"]
+                Region.FULL, 2, 12, message, self.colours["white"], self.fonts["sm"]
             )
             self.matrix_canvas.render_frame(canvas)
             return
@@ -66,23 +88,36 @@ class NHLFavouriteTeamScene(Scene):
         self.matrix_canvas.clear_region(Region.FULL)
 
         if self.show_stats:
-            self._build_stats_image()
+            self._build_stats_image(snapshot.data["team_stats"])
         else:
-            self._build_next_game_image()
+            self._build_next_game_image(snapshot.data["next_game"])
+
+        if self.refresher.is_stale:
+            self.matrix_canvas.draw_data_age(
+                Region.FULL,
+                snapshot.age_label(),
+                self.colours["grey_light"],
+                self.fonts["xsm"],
+            )
 
         self.matrix_canvas.render_frame(canvas)
 
-    def _get_team_stats(self, team):
-        standings = get_standings()
+    def _fetch_team_data(self):
+        fav_team = self.config.get("favourite_team", "MTL")
+        schedule = self.schedule_refresher.data
+        if schedule is None:
+            # Retried shortly by the refresher, once the schedule has loaded.
+            raise RuntimeError("season schedule not loaded yet")
+        return {
+            "next_game": get_next_game(schedule, fav_team),
+            "team_stats": self._get_team_stats(fav_team),
+        }
 
-        for team_data in standings["league"]["leagues"]["NHL"]["teams"]:
-            if team_data["team_abrv"] == team:
-                self.team_stats = team_data
-                return
+    def _get_team_stats(self, team):
+        return get_standings().find_team(team)
 
-    def _build_next_game_image(self):
+    def _build_next_game_image(self, game):
         fav_team = self.config.get("favourite_team", "MTL")
-        game = self.next_game_data
 
         self._add_team_logo(fav_team)
 
@@ -93,17 +128,17 @@ class NHLFavouriteTeamScene(Scene):
             Region.FULL, (34, 10), (60, 10), self.colours["white"]
         )
 
-        if game["is_today"]:
-            if game["has_started"]:
+        if game.is_today:
+            if game.has_started:
                 self.matrix_canvas.draw_text(
                     Region.FULL, 38, 11, "IPR", self.colours["white"], self.fonts["med"]
                 )
             else:
-                time_str = game["start_datetime_local"].strftime("%H:%M")
+                time_str = game.start_datetime_local.strftime("%H:%M")
                 self._draw_time(time_str, 11)
         else:
-            month = game["start_datetime_local"].strftime("%b")
-            day = game["start_datetime_local"].strftime("%-d")
+            month = game.start_datetime_local.strftime("%b")
+            day = game.start_datetime_local.strftime("%-d")
             month_col = 37 if len(day) == 1 else 35
             self.matrix_canvas.draw_text(
                 Region.FULL,
@@ -118,7 +153,7 @@ class NHLFavouriteTeamScene(Scene):
                 Region.FULL, day_col, 12, day, self.colours["white"], self.fonts["sm"]
             )
 
-        if game["home_or_away"] == "home":
+        if game.home_or_away == "home":
             self.matrix_canvas.draw_multichar_text(
                 Region.FULL, [34, 38], 23, "VS", self.colours["white"], self.fonts["sm"]
             )
@@ -126,7 +161,7 @@ class NHLFavouriteTeamScene(Scene):
                 Region.FULL,
                 44,
                 21,
-                game["opponent_abrv"],
+                game.opponent_abrv,
                 self.colours["white"],
                 self.fonts["med_bold"],
             )
@@ -138,12 +173,12 @@ class NHLFavouriteTeamScene(Scene):
                 Region.FULL,
                 43,
                 21,
-                game["opponent_abrv"],
+                game.opponent_abrv,
                 self.colours["white"],
                 self.fonts["med_bold"],
             )
 
-    def _build_stats_image(self):
+    def _build_stats_image(self, team_stats):
         fav_team = self.config.get("favourite_team", "MTL")
 
         self._add_team_logo(fav_team)
@@ -155,12 +190,12 @@ class NHLFavouriteTeamScene(Scene):
             Region.FULL, (34, 10), (60, 10), self.colours["white"]
         )
 
-        if self.team_stats:
+        if team_stats:
             # self.matrix_canvas.draw_text(
             #     Region.FULL,
             #     34,
             #     14,
-            #     f"{self.team_stats['wins']}-{self.team_stats['losses']}-{self.team_stats['ot_losses']}",
+            #     f"{team_stats.wins}-{team_stats.losses}-{team_stats.ot_losses}",
             #     self.colours["white"],
             #     self.fonts["xsm"],
             # )
@@ -168,7 +203,7 @@ class NHLFavouriteTeamScene(Scene):
                 Region.FULL,
                 34,
                 12,
-                f"Pt:{self.team_stats['points']}",
+                f"Pt:{team_stats.points}",
                 self.colours["white"],
                 self.fonts["sm"],
             )
@@ -177,7 +212,7 @@ class NHLFavouriteTeamScene(Scene):
                 Region.FULL,
                 34,
                 20,
-                f"Rk:{self.team_stats['rank']}",
+                f"Rk:{team_stats.league_rank}",
                 self.colours["white"],
                 self.fonts["sm"],
             )
@@ -207,18 +242,11 @@ class NHLFavouriteTeamScene(Scene):
             )
 
     def _add_team_logo(self, team: str):
-        logo_path = (
-            self.app_dir / "resources" / "images" / "NHL" / "teams" / f"{team}.png"
-        )
-        if logo_path not in self.image_cache:
-            if logo_path.exists():
-                with Image.open(logo_path) as img:
-                    self.image_cache[logo_path] = img.convert("RGB").copy()
-        team_logo = self.image_cache[logo_path]
-        team_logo = crop_image(team_logo)
-        team_logo.thumbnail((30, 30))
-
-        self.matrix_canvas.paste_image_centered(Region.FULL, team_logo, 30, 30, 1, 1)
+        team_logo = self.logos.get(team)
+        if team_logo:
+            self.matrix_canvas.paste_image_centered(
+                Region.FULL, team_logo, 30, 30, 1, 1
+            )
 
     def handle_input(self, input_type: InputType):
         if input_type in [InputType.LEFT, InputType.RIGHT]:
@@ -1,31 +1,44 @@
 import math
 import time
+from collections import deque
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw, ImageFont
 
 from appkit.base import Scene
-from appkit.graphics_helpers import MatrixCanvas, Region, crop_image
+from appkit.graphics_helpers import MatrixCanvas, Region, blit_image
+from appkit.refresh import DataRefresher
+from appkit.store import ResponseStore
 from tfeos.input import InputResult, InputType
 
-from .nhl_api import get_games
+from .assets import LogoSprites
+from .nhl_api import diff_scores, get_games, next_poll_interval
+
+# How long the goal animation plays, in seconds.
+GOAL_ANIMATION_LENGTH = 4
+# Scoreboards further apart than this (e.g. one restored from disk) aren't diffed for goals.
+GOAL_DIFF_WINDOW = 300
 
 
 class NHLGamesScene(Scene):
     def __init__(self, application_config):
         self.config = application_config.config
         self.app_dir = application_config.app_dir
-        self.data = {}
         self.current_game_index = 0
         self.last_game_change = time.time()
-        self.last_update = None
-        self.image_cache = {}
+        self.logos = LogoSprites(self.app_dir)
         self.matrix_canvas = MatrixCanvas()
+        self.last_snapshot = None
+        self.frame_cache = {}
+        self.goal_events = deque()
+        self.goal_event = None
+        self.goal_started = 0.0
 
         font_path = self.app_dir / "resources" / "fonts"
         self.fonts = {
+            "xsm": ImageFont.load(str(font_path / "4x6.pil")),
             "sm": ImageFont.load(str(font_path / "Tamzen5x9r.pil")),
             "sm_bold": ImageFont.load(str(font_path / "Tamzen5x9b.pil")),
             "med": ImageFont.load(str(font_path / "Tamzen6x12r.pil")),
@@ -44,39 +57,161 @@ class NHLGamesScene(Scene):
             "green": (28, 122, 0),
         }
 
+        self.refresher = DataRefresher(
+            "NHLGamesRefresher",
+            lambda: get_games(date.today()),
+            interval=next_poll_interval,
+            store=ResponseStore(self.app_dir),
+            store_key=("score",),
+        )
+        # The stored scores are for the day they were fetched, drop them on a new day.
+        stored = self.refresher.snapshot
+        if stored and date.fromtimestamp(stored.fetched_at) != date.today():
+            self.refresher.snapshot = None
+        self.refresher.start()
+
+    def cleanup(self):
+        self.refresher.stop()
+
     def render(self, canvas) -> None:
-        if not self.last_update or (datetime.now() - self.last_update).seconds > 60:
-            self.data["games"] = get_games(date.today())
-            self.last_update = datetime.now()
+        snapshot = self.refresher.snapshot
 
-        games = self.data.get("games", [])
+        if snapshot is None:
+            self._build_loading_image()
+            self.matrix_canvas.render_frame(canvas)
+            return
+
+        games = snapshot.data
 
         if not games:
             self._build_no_games_image()
+            self._add_data_age_to_image(snapshot)
             self.matrix_canvas.render_frame(canvas)
             return
 
-        if time.time() - self.last_game_change > 4:
+        if self.current_game_index >= len(games):
+            self.current_game_index = 0
+
+        if snapshot is not self.last_snapshot:
+            self._check_for_goals(snapshot)
+
+        now = time.time()
+        if self.goal_event and now - self.goal_started > GOAL_ANIMATION_LENGTH:
+            self.goal_event = None
+            self.last_game_change = now
+        if not self.goal_event and self.goal_events:
+            self._start_goal_animation(games, self.goal_events.popleft(), now)
+
+        if not self.goal_event and now - self.last_game_change > 4:
             self.current_game_index = (self.current_game_index + 1) % len(games)
-            self.last_game_change = time.time()
+            self.last_game_change = now
 
         game = games[self.current_game_index]
+        frame = self._get_game_frame(game)
 
+        if not self.goal_event and not self.refresher.is_stale:
+            blit_image(canvas, frame)
+            return
+
+        self.matrix_canvas.draw_image(Region.FULL, 0, 0, frame)
+        if self.goal_event:
+            self._add_goal_animation_to_image(now)
+        self._add_data_age_to_image(snapshot)
+
+        self.matrix_canvas.render_frame(canvas)
+
+    def _frame_key(self, game):
+        """Everything that changes what a game's frame looks like"""
+        return (
+            game.game_id,
+            game.status,
+            game.away_score,
+            game.home_score,
+            game.period_num,
+            game.period_type,
+            game.period_time_remaining,
+            game.is_intermission,
+            game.start_datetime_local,
+        )
+
+    def _get_game_frame(self, game):
+        """Composited 64x32 frame for a game, only redrawn when its state changes"""
+        key = self._frame_key(game)
+        frame = self.frame_cache.get(key)
+        if frame is None:
+            frame = self._build_game_frame(game)
+            self.frame_cache[key] = frame
+        return frame
+
+    def _build_game_frame(self, game):
         for region in [Region.LEFT, Region.CENTRE, Region.RIGHT, Region.FULL]:
             self.matrix_canvas.clear_region(region)
 
-        if game["status"] in ["FUT", "PRE"]:
+        if game.status in ["FUT", "PRE"]:
             self._build_game_not_started_image(game)
-        elif game["status"] in ["LIVE", "CRIT"]:
+        elif game.status in ["LIVE", "CRIT"]:
             self._build_game_in_progress_image(game)
-        elif game["status"] in ["OFF", "FINAL"]:
+        elif game.status in ["OFF", "FINAL"]:
             self._build_game_complete_image(game)
 
         self.matrix_canvas.copy_region_to_full(Region.LEFT, -19, 1)
         self.matrix_canvas.copy_region_to_full(Region.CENTRE, 22, 1)
         self.matrix_canvas.copy_region_to_full(Region.RIGHT, 43, 1)
+        return self.matrix_canvas.sub_images[Region.FULL].copy()
 
-        self.matrix_canvas.render_frame(canvas)
+    def _check_for_goals(self, snapshot):
+        previous = self.last_snapshot
+        self.last_snapshot = snapshot
+
+        # Drop frames for game states that are no longer on the scoreboard
+        keys = {self._frame_key(game) for game in snapshot.data}
+        self.frame_cache = {
+            key: frame for key, frame in self.frame_cache.items() if key in keys
+        }
+
+        if previous and snapshot.fetched_at - previous.fetched_at <= GOAL_DIFF_WINDOW:
+            self.goal_events.extend(diff_scores(previous.data, snapshot.data))
+
+    def _start_goal_animation(self, games, event, now):
+        for index, game in enumerate(games):
+            if game.game_id == event.game_id:
+                self.current_game_index = index
+                self.goal_event = event
+                self.goal_started = now
+                return
+
+    def _add_goal_animation_to_image(self, now):
+        # Flash "GOAL" over the scoring team's logo, four times a second.
+        if int((now - self.goal_started) * 4) % 2:
+            return
+
+        x = 0 if self.goal_event.home_or_away == "away" else 43
+        self.matrix_canvas.draw_regions[Region.FULL].rectangle(
+            [(x, 9), (x + 20, 21)], fill=self.colours["red"]
+        )
+        self.matrix_canvas.draw_text(
+            Region.FULL,
+            x + 1,
+            10,
+            "GOAL",
+            self.colours["white"],
+            self.fonts["sm_bold"],
+        )
+
+    def _build_loading_image(self):
+        self.matrix_canvas.clear_region(Region.FULL)
+        self.matrix_canvas.draw_text(
+            Region.FULL, 2, 12, "Loading...", self.colours["white"], self.fonts["sm"]
+        )
+
+    def _add_data_age_to_image(self, snapshot):
+        if self.refresher.is_stale:
+            self.matrix_canvas.draw_data_age(
+                Region.FULL,
+                snapshot.age_label(),
+                self.colours["grey_light"],
+                self.fonts["xsm"],
+            )
 
     def _build_no_games_image(self):
         self.matrix_canvas.clear_region(Region.FULL)
@@ -121,7 +256,7 @@ class NHLGamesScene(Scene):
         self._add_team_logos_to_image(game)
         self._add_playing_period_to_image(game)
 
-        if game["period_time_remaining"] and not game["is_intermission"]:
+        if game.period_time_remaining and not game.is_intermission:
             self._add_time_to_image(game)
 
         self._add_score_to_image(game)
@@ -149,50 +284,20 @@ class NHLGamesScene(Scene):
         self._add_score_to_image(game)
 
     def _add_team_logos_to_image(self, game):
-        away_logo_path = (
-            self.app_dir
-            / "resources"
-            / "images"
-            / "NHL"
-            / "teams"
-            / f"{game['away_abrv']}.png"
-        )
-        if away_logo_path.exists():
-            if away_logo_path not in self.image_cache:
-                self.image_cache[away_logo_path] = Image.open(away_logo_path).convert(
-                    "RGB"
-                )
-            away_logo = self.image_cache[away_logo_path].copy()
-            away_logo = crop_image(away_logo)
-            away_logo.thumbnail((30, 30))
-
+        away_logo = self.logos.get(game.away_abrv)
+        if away_logo:
             away_x = 40 - away_logo.width
             away_y = (30 - away_logo.height) // 2
             self.matrix_canvas.draw_image(Region.LEFT, away_x, away_y, away_logo)
 
-        home_logo_path = (
-            self.app_dir
-            / "resources"
-            / "images"
-            / "NHL"
-            / "teams"
-            / f"{game['home_abrv']}.png"
-        )
-        if home_logo_path.exists():
-            if home_logo_path not in self.image_cache:
-                self.image_cache[home_logo_path] = Image.open(home_logo_path).convert(
-                    "RGB"
-                )
-            home_logo = self.image_cache[home_logo_path].copy()
-            home_logo = crop_image(home_logo)
-            home_logo.thumbnail((30, 30))
-
+        home_logo = self.logos.get(game.home_abrv)
+        if home_logo:
             home_y = (30 - home_logo.height) // 2
             self.matrix_canvas.draw_image(Region.RIGHT, 0, home_y, home_logo)
 
     def _add_score_to_image(self, game):
-        away_score = str(game["away_score"] or 0)
-        home_score = str(game["home_score"] or 0)
+        away_score = str(game.away_score or 0)
+        home_score = str(game.home_score or 0)
 
         self.matrix_canvas.draw_score_pair(
             Region.CENTRE,
@@ -206,14 +311,14 @@ class NHLGamesScene(Scene):
         )
 
     def _add_playing_period_to_image(self, game):
-        if game["is_intermission"]:
+        if game.is_intermission:
             self.matrix_canvas.draw_text(
                 Region.CENTRE, 1, 7, "INT", self.colours["white"], self.fonts["med"]
             )
             return
 
-        period_num = game.get("period_num")
-        period_type = game.get("period_type", "REG")
+        period_num = game.period_num
+        period_type = game.period_type or "REG"
 
         if not period_num:
             return
@@ -274,11 +379,11 @@ class NHLGamesScene(Scene):
             )
 
     def _add_time_to_image(self, game):
-        if game["has_started"]:
-            time_str = game["period_time_remaining"]
+        if game.has_started:
+            time_str = game.period_time_remaining
             row_offset = 0
         else:
-            time_str = game["start_datetime_local"].strftime("%H:%M")
+            time_str = game.start_datetime_local.strftime("%H:%M")
             row_offset = 13
 
         self.matrix_canvas.draw_time_display(
@@ -292,7 +397,7 @@ class NHLGamesScene(Scene):
 
     def handle_input(self, input_type: InputType):
         if input_type in [InputType.LEFT, InputType.RIGHT]:
-            games = self.data.get("games", [])
+            games = self.refresher.data
             if games:
                 if input_type == InputType.RIGHT:
                     self.current_game_index = (self.current_game_index + 1) % len(games)
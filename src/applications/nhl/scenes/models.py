@@ -0,0 +1,157 @@
+import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+from appkit.store import storable
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class Game:
+    """One game on the scoreboard."""
+
+    game_id: int
+    home_abrv: str
+    away_abrv: str
+    home_score: Optional[int]  # Doesn't exist until game starts.
+    away_score: Optional[int]
+    start_datetime_utc: datetime
+    start_datetime_local: datetime
+    status: str
+    period_num: Optional[int]  # Doesn't exist until game starts.
+    period_type: Optional[str]
+    period_time_remaining: Optional[str]
+    is_intermission: Optional[bool]
+
+    @property
+    def has_started(self) -> bool:
+        return self.status in ("LIVE", "CRIT", "OFF", "FINAL")
+
+
+@dataclass(frozen=True, slots=True)
+class GoalEvent:
+    """A goal spotted by comparing two consecutive scoreboards."""
+
+    game_id: int
+    scoring_team: str
+    home_or_away: str
+    away_score: int
+    home_score: int
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class NextGame:
+    """The next (or current) game for a single team."""
+
+    home_or_away: str
+    opponent_abrv: str
+    start_datetime_utc: datetime
+    start_datetime_local: datetime
+    status: str
+
+    @property
+    def has_started(self) -> bool:
+        return self.status in ("LIVE", "CRIT")
+
+    @property
+    def is_today(self) -> bool:
+        # Also true for a game that started yesterday and is still going.
+        now = datetime.now().astimezone()
+        return (
+            self.start_datetime_local.date() == now.date()
+            or self.start_datetime_local < now
+        )
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class ScheduledGame:
+    """A game on the season schedule, without any live state."""
+
+    game_id: int
+    home_abrv: str
+    away_abrv: str
+    start_datetime_utc: datetime
+    start_datetime_local: datetime
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class SeasonSchedule:
+    """Every remaining game of the season, sorted by start time, indexed by team."""
+
+    games: List[ScheduledGame]
+    team_games: Dict[str, List[int]]  # Indices into games, in start order.
+
+    def games_on(self, day: date) -> List[ScheduledGame]:
+        """League-wide games starting on a local calendar day"""
+        start = datetime.combine(day, datetime.min.time()).astimezone()
+        end = start + timedelta(days=1)
+        key = lambda game: game.start_datetime_utc
+        lo = bisect.bisect_left(self.games, start, key=key)
+        hi = bisect.bisect_left(self.games, end, lo=lo, key=key)
+        return self.games[lo:hi]
+
+    def games_for(self, team_abrv: str, after: datetime) -> List[ScheduledGame]:
+        """A team's games starting at or after `after`, in start order"""
+        indices = self.team_games.get(team_abrv, [])
+        key = lambda i: self.games[i].start_datetime_utc
+        lo = bisect.bisect_left(indices, after, key=key)
+        return [self.games[i] for i in indices[lo:]]
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class TeamStanding:
+    """A team's record and its rank in every standings view."""
+
+    team_abrv: str
+    division_name: str
+    conference_name: str
+    points: int
+    has_clinched: bool
+    wins: int
+    losses: int
+    ot_losses: int
+    division_rank: int
+    conference_rank: int
+    league_rank: int
+    # Top 3 teams in each division show their division rank (e.g. "A1") instead.
+    wildcard_rank: Union[int, str]
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class StandingsView:
+    """An ordered selection of teams from the shared standings table."""
+
+    abrv: str
+    rank_field: str  # TeamStanding attribute shown as the rank in this view.
+    team_indices: List[int]
+
+
+@storable
+@dataclass(frozen=True, slots=True)
+class Standings:
+    """Every team once, plus the division, wildcard, conference and league views over them."""
+
+    teams: List[TeamStanding]
+    divisions: Dict[str, StandingsView]
+    wildcard: Dict[str, StandingsView]
+    conferences: Dict[str, StandingsView]
+    league: StandingsView
+
+    def rows(self, view: StandingsView) -> List[Tuple[Union[int, str], TeamStanding]]:
+        """(rank, team) pairs for a view, in standings order"""
+        return [
+            (getattr(self.teams[i], view.rank_field), self.teams[i])
+            for i in view.team_indices
+        ]
+
+    def find_team(self, team_abrv: str) -> Optional[TeamStanding]:
+        for team in self.teams:
+            if team.team_abrv == team_abrv:
+                return team
+        return None
@@ -1,30 +1,214 @@
+import logging
+import time
+from concurrent.futures import Future
 from datetime import datetime as dt
+from datetime import timedelta
 from datetime import timezone as tz
+from threading import Lock
 
-import requests
-from requests.adapters import HTTPAdapter, Retry
+from appkit.http_client import shared_http_client
 
-# Create a session and define a retry strategy. Used for API calls.
-session = requests.Session()
-retry_strategy = Retry(
-    total=10,  # Maximum number of retries.
-    backoff_factor=0.5,
-    status_forcelist=[429, 500, 502, 503, 504],  # HTTP status codes to retry on.
+from .models import (
+    Game,
+    GoalEvent,
+    NextGame,
+    ScheduledGame,
+    SeasonSchedule,
+    Standings,
+    StandingsView,
+    TeamStanding,
 )
-session.mount("http://", HTTPAdapter(max_retries=retry_strategy))
+
+logger = logging.getLogger(__name__)
+
+# Pooled client shared with the other apps, retries and timeouts are handled there.
+session = shared_http_client()
+
+DIVISION_ABRVS = {
+    "Atlantic": "Atl",
+    "Metropolitan": "Met",
+    "Central": "Cen",
+    "Pacific": "Pac",
+}
+CONFERENCE_ABRVS = {"Eastern": "Est", "Western": "Wst"}
+
+# How long a parsed response is reused before the endpoint is fetched again, in seconds.
+GAMES_TTL = 10
+SEASON_SCHEDULE_TTL = 24 * 60 * 60
+STANDINGS_TTL = 240
+
+# A game that started longer ago than this is assumed to be over.
+MAX_GAME_LENGTH = timedelta(hours=8)
+# Upper bound on schedule weeks walked in one fetch, in case nextStartDate loops.
+MAX_SCHEDULE_WEEKS = 60
+
+
+class ResponseCache:
+    """Caches parsed API results per key, sharing in-flight fetches between callers.
+
+    Concurrent callers asking for the same key while it is being fetched wait
+    on the one request instead of starting their own. If a refresh fails, the
+    last parsed result is returned instead, however old it is.
+    Cached results are shared, so callers must not modify them.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._entries = {}  # key -> (fetched_at, value)
+        self._in_flight = {}  # key -> Future
+
+    def get(self, key, ttl, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = fetch()
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value)
+            future.set_result(value)
+        except Exception as e:
+            if entry is None:
+                future.set_exception(e)
+            else:
+                logger.warning(f"Refreshing {key} failed, serving stale data: {e}")
+                future.set_result(entry[1])
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+        return future.result()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+cache = ResponseCache()
+
+# Scoreboard polling intervals, in seconds.
+LIVE_POLL = 15  # Any game in progress.
+PREGAME_POLL = 60  # A game is due to start, or is running late.
+PUCK_DROP_LEAD = 300  # Wake up this long before the next scheduled start.
+MAX_POLL = 3 * 60 * 60  # Never sleep longer than this, in case the schedule moves.
+
+
+def next_poll_interval(games, now=None):
+    """Plans how long to wait before fetching the scoreboard again.
+
+    Polls quickly while any game is live, sleeps until shortly before the next
+    puck drop when every remaining game is in the future, and stops until the
+    next day once every game is over.
+
+    Args:
+        games (list): Games as returned by get_games.
+        now (datetime, optional): Current time (timezone aware). Defaults to now.
+
+    Returns:
+        float: Seconds until the next poll.
+    """
+
+    now = now or dt.now(tz=tz.utc)
+
+    if any(game.status in ("LIVE", "CRIT") for game in games):
+        return LIVE_POLL
+
+    upcoming = [
+        game.start_datetime_utc for game in games if game.status not in ("OFF", "FINAL")
+    ]
+    if upcoming:
+        until_puck_drop = (min(upcoming) - now).total_seconds() - PUCK_DROP_LEAD
+        return min(max(until_puck_drop, PREGAME_POLL), MAX_POLL)
+
+    # No games left today, check again once tomorrow's scoreboard is up.
+    local_now = now.astimezone()
+    tomorrow = (local_now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return min(max((tomorrow - local_now).total_seconds(), PREGAME_POLL), MAX_POLL)
+
+
+def diff_scores(previous, current):
+    """Finds goals scored between two scoreboards of the same day.
+
+    Games are matched on game_id. Only score increases count, so a goal taken
+    back on review doesn't produce an event.
+
+    Args:
+        previous (list): Games from the earlier scoreboard.
+        current (list): Games from the newer scoreboard.
+
+    Returns:
+        list: GoalEvent for every team whose score went up.
+    """
+
+    previous_scores = {
+        game.game_id: (game.away_score or 0, game.home_score or 0) for game in previous
+    }
+
+    events = []
+    for game in current:
+        scores = previous_scores.get(game.game_id)
+        if scores is None:
+            continue
+
+        away_score, home_score = game.away_score or 0, game.home_score or 0
+        if away_score > scores[0]:
+            events.append(
+                GoalEvent(game.game_id, game.away_abrv, "away", away_score, home_score)
+            )
+        if home_score > scores[1]:
+            events.append(
+                GoalEvent(game.game_id, game.home_abrv, "home", away_score, home_score)
+            )
+
+    return events
 
 
 def get_games(date):
+    """Loads NHL game data for the provided date, reusing recent results.
+
+    Args:
+        date (date): Date that game data should be pulled for.
+
+    Returns:
+        list: List of Game objects.
+    """
+
+    return cache.get(("score", date.isoformat()), GAMES_TTL, lambda: _fetch_games(date))
+
+
+def _parse_start_time(start_time_utc):
+    """Parses an API start time once, returning (utc, local) datetimes."""
+
+    start_utc = dt.strptime(start_time_utc, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=tz.utc)
+    return start_utc, start_utc.astimezone(tz=None)  # Convert UTC to local time.
+
+
+def _fetch_games(date):
     """Loads NHL game data for the provided date.
 
     Args:
         date (date): Date that game data should be pulled for.
 
     Returns:
-        list: List of dicts of game data.
+        list: List of Game objects.
     """
 
-    # Create an empty list to hold the game dicts.
+    # Create an empty list to hold the games.
     games = []
 
     # Call the NHL game API for the date specified and store the JSON results.
@@ -32,125 +216,145 @@ def get_games(date):
     games_response = session.get(url=f"{url}{date.strftime(format='%Y-%m-%d')}")
     games_json = games_response.json()["games"]
 
-    # For each game, build a dict recording current game details.
-    if games_json:  # If games today.
-        for game in games_json:
-            # Append the dict to the games list. We only want to get regular season (gameType = 2) and playoff (3) games.
-            # Note that 19 and 20 may need to be included. These were used for the 4 Nations Face-Off round robin & finals and will be evaluated again in the future.
-            if game["gameType"] in [2, 3]:
-                games.append(
-                    {
-                        "game_id": game["id"],
-                        "home_abrv": game["homeTeam"]["abbrev"],
-                        "away_abrv": game["awayTeam"]["abbrev"],
-                        "home_score": game["homeTeam"].get(
-                            "score"
-                        ),  # Doesn't exist until game starts.
-                        "away_score": game["awayTeam"].get("score"),
-                        "start_datetime_utc": dt.strptime(
-                            game["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ"
-                        ).replace(tzinfo=tz.utc),
-                        "start_datetime_local": dt.strptime(
-                            game["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ"
-                        )
-                        .replace(tzinfo=tz.utc)
-                        .astimezone(tz=None),  # Convert UTC to local time.
-                        "status": game["gameState"],
-                        "has_started": (
-                            True
-                            if game["gameState"] in ["LIVE", "CRIT", "OFF", "FINAL"]
-                            else False
-                        ),
-                        "period_num": game.get("period"),  # Doesn't until game starts.
-                        "period_type": game.get("periodDescriptor", {}).get(
-                            "periodType"
-                        ),  # periodDescriptor doesn't exist until game starts.
-                        "period_time_remaining": game.get("clock", {}).get(
-                            "timeRemaining"
-                        ),  # clock doesn't exist until game starts.
-                        "is_intermission": game.get("clock", {}).get("inIntermission"),
-                        # Will set the remaining later, default to False and None for now.
-                        "home_team_scored": False,
-                        "away_team_scored": False,
-                        "scoring_team": None,
-                    }
-                )
+    # For each game, build a Game recording current game details.
+    for game in games_json or []:
+        # We only want to get regular season (gameType = 2) and playoff (3) games.
+        # Note that 19 and 20 may need to be included. These were used for the 4 Nations Face-Off round robin & finals and will be evaluated again in the future.
+        if game["gameType"] not in [2, 3]:
+            continue
+
+        start_utc, start_local = _parse_start_time(game["startTimeUTC"])
+        clock = game.get("clock", {})  # clock doesn't exist until game starts.
+        games.append(
+            Game(
+                game_id=game["id"],
+                home_abrv=game["homeTeam"]["abbrev"],
+                away_abrv=game["awayTeam"]["abbrev"],
+                home_score=game["homeTeam"].get("score"),
+                away_score=game["awayTeam"].get("score"),
+                start_datetime_utc=start_utc,
+                start_datetime_local=start_local,
+                status=game["gameState"],
+                period_num=game.get("period"),
+                # periodDescriptor doesn't exist until game starts.
+                period_type=game.get("periodDescriptor", {}).get("periodType"),
+                period_time_remaining=clock.get("timeRemaining"),
+                is_intermission=clock.get("inIntermission"),
+            )
+        )
 
     return games
 
 
-def get_next_game(team):
-    """Loads next game details for the supplied NHL team.
+def get_season_schedule():
+    """Loads the rest of the season's schedule for the whole league, at most once a day.
+
+    Returns:
+        SeasonSchedule: Remaining games, indexed by start time and team.
+    """
+
+    return cache.get(("season",), SEASON_SCHEDULE_TTL, _fetch_season_schedule)
+
+
+def _fetch_season_schedule():
+    """Loads every game from yesterday to the end of the season, a week at a time.
+
+    Returns:
+        SeasonSchedule: Remaining games, indexed by start time and team.
+    """
+
+    # Start a day back so a game that ran past midnight is still indexed.
+    games = {}
+    week_start = (dt.now().date() - timedelta(days=1)).isoformat()
+    for _ in range(MAX_SCHEDULE_WEEKS):
+        url = f"https://api-web.nhle.com/v1/schedule/{week_start}"
+        schedule_json = session.get(url=url).json()
+
+        for day in schedule_json.get("gameWeek", []):
+            for game in day["games"]:
+                start_utc, start_local = _parse_start_time(game["startTimeUTC"])
+                games[game["id"]] = ScheduledGame(
+                    game_id=game["id"],
+                    home_abrv=game["homeTeam"]["abbrev"],
+                    away_abrv=game["awayTeam"]["abbrev"],
+                    start_datetime_utc=start_utc,
+                    start_datetime_local=start_local,
+                )
+
+        # nextStartDate points at the next week with games, and is missing after the last one.
+        next_week_start = schedule_json.get("nextStartDate")
+        if not next_week_start or next_week_start <= week_start:
+            break
+        week_start = next_week_start
+
+    ordered = sorted(games.values(), key=lambda game: game.start_datetime_utc)
+    team_games = {}
+    for i, game in enumerate(ordered):
+        team_games.setdefault(game.away_abrv, []).append(i)
+        team_games.setdefault(game.home_abrv, []).append(i)
+
+    return SeasonSchedule(games=ordered, team_games=team_games)
+
+
+def get_next_game(schedule, team, now=None):
+    """Finds the next game for the supplied NHL team in the season schedule.
     If the team is currently playing, will return details of the current game.
 
+    Only games that may already have started are checked against the day's
+    scoreboard, so the full schedule is never downloaded for this.
+
     Args:
+        schedule (SeasonSchedule): Schedule as returned by get_season_schedule.
         team (str): Three char abbreviation of the team to pull next game details for.
+        now (datetime, optional): Current time (timezone aware). Defaults to now.
 
     Returns:
-            dict: Dict of next game details.
+        NextGame: Next game details, or None if the team has no games left.
     """
 
-    # Note the current datetime.
-    cur_datetime = dt.today().astimezone()
-    cur_date = dt.today().astimezone().date()
+    now = now or dt.now(tz=tz.utc)
+    today = now.astimezone().date()
 
-    # Call the NHL schedule API for the team specified and store the JSON results.
-    url = f"https://api-web.nhle.com/v1/club-schedule-season/{team}/now"
-    schedule_response = session.get(url=url)
-    schedule_json = schedule_response.json()["games"]
+    for game in schedule.games_for(team, now - MAX_GAME_LENGTH):
+        status = "FUT"
+        game_day = game.start_datetime_local.date()
+        if game_day <= today:
+            scoreboard = {g.game_id: g for g in get_games(game_day)}
+            live_game = scoreboard.get(game.game_id)
+            if live_game:
+                status = live_game.status
+            elif game.start_datetime_utc <= now:
+                status = "OFF"  # Not on the scoreboard, assume it's done.
+        if status in ("OFF", "FINAL"):
+            continue
 
-    # Filter results to games that have not already concluded. Get the 0th element, the next game.
-    upcoming_games = [
-        game
-        for game in schedule_json
-        if game["gameState"] in ("FUT", "PRE", "LIVE", "CRIT")
-    ]
-    next_game_details = upcoming_games[0]
-
-    # Put together a dictionary with needed details.
-    next_game = {
-        "home_or_away": (
-            "away" if next_game_details["homeTeam"]["abbrev"] != team else "home"
-        ),
-        "opponent_abrv": (
-            next_game_details["homeTeam"]["abbrev"]
-            if next_game_details["homeTeam"]["abbrev"] != team
-            else next_game_details["awayTeam"]["abbrev"]
-        ),
-        "start_datetime_utc": dt.strptime(
-            next_game_details["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ"
-        ).replace(tzinfo=tz.utc),
-        "start_datetime_local": dt.strptime(
-            next_game_details["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ"
+        is_home = game.home_abrv == team
+        return NextGame(
+            home_or_away="home" if is_home else "away",
+            opponent_abrv=game.away_abrv if is_home else game.home_abrv,
+            start_datetime_utc=game.start_datetime_utc,
+            start_datetime_local=game.start_datetime_local,
+            status=status,
         )
-        .replace(tzinfo=tz.utc)
-        .astimezone(tz=None),
-        "is_today": (
-            True
-            if dt.strptime(next_game_details["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ")
-            .replace(tzinfo=tz.utc)
-            .astimezone(tz=None)
-            .date()
-            == cur_date
-            or dt.strptime(next_game_details["startTimeUTC"], "%Y-%m-%dT%H:%M:%SZ")
-            .replace(tzinfo=tz.utc)
-            .astimezone(tz=None)
-            < cur_datetime
-            else False
-        ),  # TODO: clean this up. Needed in case game is still going when date rolls over.
-        "has_started": (
-            True if next_game_details["gameState"] in ("LIVE", "CRIT") else False
-        ),
-    }
 
-    return next_game
+    return None  # Season is over.
 
 
 def get_standings():
+    """Loads current NHL standings, shared between every scene that needs them.
+
+    Returns:
+        Standings: Standings for every category.
+    """
+
+    return cache.get(("standings",), STANDINGS_TTL, _fetch_standings)
+
+
+def _fetch_standings():
     """Loads current NHL standings by division, wildcard, conference, and overall league.
 
     Returns:
-        dict: Dict containing all standings by each category.
+        Standings: One shared team table with a view per category.
     """
 
     # Call the NHL standings API and store the JSON results.
@@ -158,105 +362,67 @@ def get_standings():
     standings_response = session.get(url=url)
     standings_json = standings_response.json()["standings"]
 
-    # Set up structure of the returned dict.
-    # Teams lists will be populated w/ the API results.
-    standings = {
-        "division": {
-            "playoff_cutoff_soft": 3,  # Notes how many teams from each div make the playoffs before wildcards.
-            "divisions": {
-                "Atlantic": {"abrv": "Atl", "teams": []},
-                "Metropolitan": {"abrv": "Met", "teams": []},
-                "Central": {"abrv": "Cen", "teams": []},
-                "Pacific": {"abrv": "Pac", "teams": []},
-            },
-        },
-        "wildcard": {
-            "playoff_cutoff_hard": 8,  # Not exactly true... but will help build the images. Total num of playoff bound teams.
-            "playoff_cutoff_soft": 6,
-            "conferences": {
-                "Eastern": {"abrv": "Est", "teams": []},
-                "Western": {"abrv": "Wst", "teams": []},
-            },
-        },
-        # Structure for conferences and league is not the best, but want to leave open in case of future divisional changes (e.g., return to conference based playoff thresholds).
-        "conference": {
-            "conferences": {
-                "Eastern": {"abrv": "Est", "teams": []},
-                "Western": {"abrv": "Wst", "teams": []},
-            }
-        },
-        "league": {"leagues": {"NHL": {"abrv": "All", "teams": []}}},
-    }
-
-    # Populate the team lists w/ dicts containing details of each team.
+    # Each team is parsed once, the views below only hold indices into this table.
     # API returns teams in overall standing order, so generally won't have to sort.
+    teams = []
+    wildcard_sort_keys = []
     for team in standings_json:
-        # Divisions.
-        standings["division"]["divisions"][team["divisionName"]]["teams"].append(
-            {
-                "team_abrv": team["teamAbbrev"]["default"],
-                "rank": team["divisionSequence"],
-                "points": team["points"],
-                "has_clinched": (
-                    True if hasattr(team, "clinchIndicator") else False
-                ),  # The clinchIndicator key will only exist for teams that have clinched.
-                "wins": team["regulationPlusOtWins"],
-                "losses": team["losses"],
-                "ot_losses": team["otLosses"],
-            }
-        )
-
-        # Wildcard by conference.
-        standings["wildcard"]["conferences"][team["conferenceName"]]["teams"].append(
-            {
-                "team_abrv": team["teamAbbrev"]["default"],
-                "rank": (
+        teams.append(
+            TeamStanding(
+                team_abrv=team["teamAbbrev"]["default"],
+                division_name=team["divisionName"],
+                conference_name=team["conferenceName"],
+                points=team["points"],
+                # The clinchIndicator key will only exist for teams that have clinched.
+                has_clinched="clinchIndicator" in team,
+                wins=team["regulationPlusOtWins"],
+                losses=team["losses"],
+                ot_losses=team["otLosses"],
+                division_rank=team["divisionSequence"],
+                conference_rank=team["conferenceSequence"],
+                league_rank=team["leagueSequence"],
+                # Top 3 teams will have a wildcardSequence of 0.
+                wildcard_rank=(
                     team["wildcardSequence"]
                     if team["wildcardSequence"] != 0
                     else team["divisionAbbrev"] + str(team["divisionSequence"])
-                ),  # Top 3 teams will have a wildcardSequence of 0.
-                # Rank helper will allow us to group top 3 teams in each div so they appear together at the top of the WC standings.
-                "rank_helper": (
-                    "W" + str(team["wildcardSequence"]).zfill(2)
-                    if team["wildcardSequence"] != 0
-                    else team["divisionAbbrev"] + str(team["divisionSequence"])
                 ),
-                "points": team["points"],
-                "has_clinched": True if hasattr(team, "clinchIndicator") else False,
-                "wins": team["regulationPlusOtWins"],
-                "losses": team["losses"],
-                "ot_losses": team["otLosses"],
-            }
+            )
         )
-
-        # Conference.
-        standings["conference"]["conferences"][team["conferenceName"]]["teams"].append(
-            {
-                "team_abrv": team["teamAbbrev"]["default"],
-                "rank": team["conferenceSequence"],
-                "points": team["points"],
-                "has_clinched": True if hasattr(team, "clinchIndicator") else False,
-                "wins": team["regulationPlusOtWins"],
-                "losses": team["losses"],
-                "ot_losses": team["otLosses"],
-            }
+        # Sort key groups the top 3 teams in each div so they appear together at the top of the WC standings.
+        wildcard_sort_keys.append(
+            "W" + str(team["wildcardSequence"]).zfill(2)
+            if team["wildcardSequence"] != 0
+            else team["divisionAbbrev"] + str(team["divisionSequence"])
         )
 
-        # Overall league.
-        standings["league"]["leagues"]["NHL"]["teams"].append(
-            {
-                "team_abrv": team["teamAbbrev"]["default"],
-                "rank": team["leagueSequence"],
-                "points": team["points"],
-                "has_clinched": True if hasattr(team, "clinchIndicator") else False,
-                "wins": team["regulationPlusOtWins"],
-                "losses": team["losses"],
-                "ot_losses": team["otLosses"],
-            }
-        )
+    def view(abrv, rank_field, indices):
+        return StandingsView(abrv=abrv, rank_field=rank_field, team_indices=indices)
 
-    # Sort team list within wildcard to correctly group top three teams in each division.
-    for con in standings["wildcard"]["conferences"].values():
-        con["teams"] = sorted(con["teams"], key=lambda d: d["rank_helper"])
+    def members(attr, name):
+        return [i for i, team in enumerate(teams) if getattr(team, attr) == name]
 
-    return standings
+    # Structure for conferences and league is not the best, but want to leave open in case of future divisional changes (e.g., return to conference based playoff thresholds).
+    return Standings(
+        teams=teams,
+        divisions={
+            name: view(abrv, "division_rank", members("division_name", name))
+            for name, abrv in DIVISION_ABRVS.items()
+        },
+        wildcard={
+            name: view(
+                abrv,
+                "wildcard_rank",
+                sorted(
+                    members("conference_name", name),
+                    key=lambda i: wildcard_sort_keys[i],
+                ),
+            )
+            for name, abrv in CONFERENCE_ABRVS.items()
+        },
+        conferences={
+            name: view(abrv, "conference_rank", members("conference_name", name))
+            for name, abrv in CONFERENCE_ABRVS.items()
+        },
+        league=view("All", "league_rank", list(range(len(teams)))),
+    )
@@ -9,6 +9,8 @@ from PIL import Image, ImageDraw, ImageFont
 from tfeos.input import InputType, InputResult
 from appkit.base import Scene
 from appkit.graphics_helpers import MatrixCanvas, Region
+from appkit.refresh import DataRefresher
+from appkit.store import ResponseStore
 
 from .nhl_api import get_standings
 
@@ -17,11 +19,9 @@ class NHLStandingsScene(Scene):
     def __init__(self, application_config):
         self.config = application_config.config
         self.app_dir = application_config.app_dir
-        self.data = {}
         self.current_view_type = None
         self.current_division_index = 0
         self.current_conference_index = 0
-        self.last_update = None
         self.scroll_offset = 0
         self.last_scroll_time = time.time()
         self.scroll_pause_until = time.time() + 0.5
@@ -31,14 +31,14 @@ class NHLStandingsScene(Scene):
         self.conferences = ["Eastern", "Western"]
 
         self.matrix_canvas = MatrixCanvas()
-        
-        self.side_region = Image.new("RGB", (8, 32))
-        self.standings_region = Image.new("RGB", (56, 256))
-        self.side_draw = ImageDraw.Draw(self.side_region)
-        self.standings_draw = ImageDraw.Draw(self.standings_region)
+
+        # (side label, standings strip) per view, rebuilt only when the data changes
+        self.strips = {}
+        self.strips_source = None
 
         font_path = self.app_dir / "resources" / "fonts"
         self.fonts = {
+            "xsm": ImageFont.load(str(font_path / "4x6.pil")),
             "sm": ImageFont.load(str(font_path / "Tamzen5x9r.pil")),
             "sm_bold": ImageFont.load(str(font_path / "Tamzen5x9b.pil")),
             "med": ImageFont.load(str(font_path / "Tamzen6x12r.pil")),
@@ -59,6 +59,18 @@ class NHLStandingsScene(Scene):
 
         self._initialize_view()
 
+        self.refresher = DataRefresher(
+            "NHLStandingsRefresher",
+            get_standings,
+            interval=300,
+            store=ResponseStore(self.app_dir),
+            store_key=("standings",),
+        )
+        self.refresher.start()
+
+    def cleanup(self):
+        self.refresher.stop()
+
     def _initialize_view(self):
         default_view = self.config.get("default_view", "Conference")
         default_division = self.config.get("default_division", "Atlantic")
@@ -73,11 +85,9 @@ class NHLStandingsScene(Scene):
             self.current_conference_index = self.conferences.index(default_conference)
 
     def render(self, canvas) -> None:
-        if not self.last_update or (datetime.now() - self.last_update).seconds > 300:
-            self.data["standings"] = get_standings()
-            self.last_update = datetime.now()
+        snapshot = self.refresher.snapshot
 
-        if not self.data.get("standings"):
+        if not snapshot or not snapshot.data:
             self.matrix_canvas.clear_region(Region.FULL)
             self.matrix_canvas.draw_text(
                 Region.FULL, 2, 12, "Loading...", self.colours["white"], self.fonts["sm"]
@@ -85,13 +95,14 @@ class NHLStandingsScene(Scene):
             self.matrix_canvas.render_frame(canvas)
             return
 
-        view_data = self._get_current_view_data()
-        if not view_data:
-            return
+        standings = snapshot.data
+        if standings is not self.strips_source:
+            self._build_strips(standings)
 
-        self._build_standings_image(view_data["name"], view_data["teams"])
+        view = self._get_current_view(standings)
+        side_image, strip_image = self.strips[view.abrv]
 
-        num_teams = len(view_data["teams"])
+        num_teams = len(view.team_indices)
         max_scroll = max(0, (num_teams - 4) * 8)
 
         if max_scroll > 0:
@@ -116,30 +127,47 @@ class NHLStandingsScene(Scene):
                     self.scroll_pause_until = current_time + 1.0
 
         self.matrix_canvas.clear_region(Region.FULL)
-        self.matrix_canvas.draw_image(Region.FULL, 0, 0, self.side_region)
-        cropped_standings = self.standings_region.crop((0, self.scroll_offset, 56, self.scroll_offset + 32))
+        self.matrix_canvas.draw_image(Region.FULL, 0, 0, side_image)
+        cropped_standings = strip_image.crop((0, self.scroll_offset, 56, self.scroll_offset + 32))
         self.matrix_canvas.draw_image(Region.FULL, 8, 0, cropped_standings)
 
-        self.matrix_canvas.render_frame(canvas)
+        if self.refresher.is_stale:
+            self.matrix_canvas.draw_data_age(
+                Region.FULL,
+                snapshot.age_label(),
+                self.colours["grey_light"],
+                self.fonts["xsm"],
+            )
 
-    def _get_current_view_data(self):
-        standings = self.data["standings"]
+        self.matrix_canvas.render_frame(canvas)
 
+    def _get_current_view(self, standings):
         if self.current_view_type == "Division":
             division = self.divisions[self.current_division_index]
-            div_data = standings["division"]["divisions"][division]
-            return {"name": div_data["abrv"], "teams": div_data["teams"]}
+            return standings.divisions[division]
         elif self.current_view_type == "Conference":
             conference = self.conferences[self.current_conference_index]
-            conf_data = standings["conference"]["conferences"][conference]
-            return {"name": conf_data["abrv"], "teams": conf_data["teams"]}
+            return standings.conferences[conference]
         else:
-            league_data = standings["league"]["leagues"]["NHL"]
-            return {"name": league_data["abrv"], "teams": league_data["teams"]}
+            return standings.league
+
+    def _build_strips(self, standings):
+        """Render every view once so scrolling and view switches only crop"""
+        views = [
+            *standings.divisions.values(),
+            *standings.conferences.values(),
+            standings.league,
+        ]
+        self.strips = {
+            view.abrv: self._build_standings_image(view.abrv, standings.rows(view))
+            for view in views
+        }
+        self.strips_source = standings
 
-    def _build_standings_image(self, name, teams):
-        self.side_draw.rectangle([(0, 0), (8, 32)], fill=(0, 0, 0))
-        self.standings_draw.rectangle([(0, 0), (56, 256)], fill=(0, 0, 0))
+    def _build_standings_image(self, name, rows):
+        side_region = Image.new("RGB", (8, 32))
+        standings_region = Image.new("RGB", (56, max(32, len(rows) * 8)))
+        standings_draw = ImageDraw.Draw(standings_region)
 
         tmp_img = Image.new("RGB", (32, 8))
         tmp_draw = ImageDraw.Draw(tmp_img)
@@ -147,63 +175,65 @@ class NHLStandingsScene(Scene):
         tmp_draw.text((1, 0), "NHL", font=self.fonts["sm"], fill=self.colours["black"])
         tmp_draw.text((17, 0), name, font=self.fonts["sm"], fill=self.colours["black"])
         tmp_img = tmp_img.rotate(90, expand=True)
-        self.side_region.paste(tmp_img, (0, 0))
+        side_region.paste(tmp_img, (0, 0))
 
         fav_team = self.config.get("favourite_team")
 
-        for row, team in enumerate(teams):
+        for row, (rank, team) in enumerate(rows):
             y_offset = row * 8
 
             team_colour = (
                 self.colours["yellow"]
-                if team["team_abrv"] == fav_team
+                if team.team_abrv == fav_team
                 else self.colours["white"]
             )
 
-            if row < len(teams) - 1:
-                self.standings_draw.line(
+            if row < len(rows) - 1:
+                standings_draw.line(
                     [(1, y_offset + 7), (54, y_offset + 7)],
                     fill=self.colours["grey_dark"],
                 )
 
-            rank_str = str(team["rank"])
+            rank_str = str(rank)
             rank_offset = 5 if len(rank_str) < 2 else 0
-            self.standings_draw.text(
+            standings_draw.text(
                 (1 + rank_offset, y_offset - 1),
                 rank_str,
                 font=self.fonts["sm"],
                 fill=team_colour,
             )
 
-            if team.get("has_clinched"):
-                self.standings_draw.text(
+            if team.has_clinched:
+                standings_draw.text(
                     (14, y_offset - 2),
                     "*",
                     font=self.fonts["med"],
                     fill=self.colours["red"],
                 )
 
-            self.standings_draw.text(
+            standings_draw.text(
                 (21, y_offset - 1),
-                team["team_abrv"],
+                team.team_abrv,
                 font=self.fonts["sm"],
                 fill=team_colour,
             )
 
-            pts_str = str(team["points"])
-            if team["points"] < 10:
+            pts_str = str(team.points)
+            if team.points < 10:
                 pts_offset = 0
-            elif team["points"] < 100:
+            elif team.points < 100:
                 pts_offset = -5
             else:
                 pts_offset = -10
-            self.standings_draw.text(
+            standings_draw.text(
                 (51 + pts_offset, y_offset - 1),
                 pts_str,
                 font=self.fonts["sm"],
                 fill=team_colour,
             )
 
+        return side_region, standings_region
+
     def _reset_scroll(self):
         self.scroll_offset = 0
         self.scroll_pause_until = time.time() + 0.5
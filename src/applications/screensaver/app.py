@@ -1,59 +1,57 @@
 import math
 import random
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from appkit.base import Application, ApplicationConfig, Scene
 from appkit.config import Config
+from appkit.framebuffer import FrameBuffer
 from appkit.graphics_helpers import Color
 from tfeos.input import InputResult, InputType
 
 
+def _build_hue_wheel(size: int = 256) -> np.ndarray:
+    """Fully saturated HSV hue wheel, one RGB row (0.0 - 1.0) per hue step"""
+    # Sample each entry at the centre of its hue bin
+    h = (np.arange(size, dtype=np.float64) + 0.5) * 6.0 / size
+    x = 1.0 - np.abs((h % 2) - 1.0)
+    sector = h.astype(np.int64)
+    ones = np.ones(size)
+    zeros = np.zeros(size)
+
+    r = np.choose(sector, [ones, x, zeros, zeros, x, ones])
+    g = np.choose(sector, [x, ones, ones, x, zeros, zeros])
+    b = np.choose(sector, [zeros, zeros, x, ones, ones, x])
+    return np.stack([r, g, b], axis=1)
+
+
+# Shared 256-entry hue lookup table, each scene quantizes it to its own palette
+HUE_WHEEL = _build_hue_wheel()
+
+
 class RainbowParasolScene(Scene):
     def __init__(self):
         self.angle = 0
+        self.frame = FrameBuffer()
+        # Scale to 0-255 and snap to 6-bit
+        self.palette = ((HUE_WHEEL * 252).astype(np.uint8)) & 0xFC
 
-    def render(self, canvas) -> None:
-        canvas.Clear()
+        # Angle of every pixel around the centre, in hue steps (0 - 256)
         center_x, center_y = 32, 16
+        ys, xs = np.mgrid[0:32, 0:64]
+        degrees = np.degrees(np.arctan2(ys - center_y, xs - center_x)) + 180
+        self.angle_map = degrees * len(HUE_WHEEL) / 360.0
 
-        for y in range(32):
-            for x in range(64):
-                dx = x - center_x
-                dy = y - center_y
-
-                pixel_angle = math.degrees(math.atan2(dy, dx)) + 180
-                pixel_angle = (pixel_angle + self.angle) % 360
-
-                # Smooth gradient using HSV
-                hue = pixel_angle / 360.0
-
-                # Convert HSV to RGB (S=1, V=1 for full saturation/brightness)
-                h = hue * 6.0
-                c = 1.0
-                x_val = 1.0 - abs((h % 2) - 1.0)
-
-                if h < 1:
-                    r, g, b = c, x_val, 0
-                elif h < 2:
-                    r, g, b = x_val, c, 0
-                elif h < 3:
-                    r, g, b = 0, c, x_val
-                elif h < 4:
-                    r, g, b = 0, x_val, c
-                elif h < 5:
-                    r, g, b = x_val, 0, c
-                else:
-                    r, g, b = c, 0, x_val
-
-                # Scale to 0-255 and snap to 6-bit
-                r = int(r * 252) & 0xFC
-                g = int(g * 252) & 0xFC
-                b = int(b * 252) & 0xFC
-
-                canvas.SetPixel(x, y, r, g, b)
+    def render(self, canvas) -> None:
+        offset = self.angle * len(HUE_WHEEL) / 360.0
+        hue_index = ((self.angle_map + offset) % len(HUE_WHEEL)).astype(np.intp)
+        self.frame.pixels[...] = self.palette[hue_index]
+        self.frame.flush(canvas)
 
         self.angle = (self.angle + 5) % 360
 
@@ -123,106 +121,94 @@ class StarfieldScene(Scene):
 class PlasmaScene(Scene):
     def __init__(self):
         self.time = 0
+        self.frame = FrameBuffer()
+        self.palette = (HUE_WHEEL * 255).astype(np.uint8)
 
-    def render(self, canvas) -> None:
-        canvas.Clear()
+        # Every term is sin(field + time), so with sin(a + t) = sin(a)cos(t) +
+        # cos(a)sin(t) the sum only needs the static fields' sin and cos totals.
+        ys, xs = np.mgrid[0:32, 0:64].astype(np.float64)
+        fields = [xs / 8.0, ys / 6.0, (xs + ys) / 10.0, np.sqrt(xs * xs + ys * ys) / 8.0]
+        self.sin_field = sum(np.sin(field) for field in fields)
+        self.cos_field = sum(np.cos(field) for field in fields)
 
-        for y in range(32):
-            for x in range(64):
-                value = math.sin(x / 8.0 + self.time)
-                value += math.sin(y / 6.0 + self.time)
-                value += math.sin((x + y) / 10.0 + self.time)
-                value += math.sin(math.sqrt(x * x + y * y) / 8.0 + self.time)
-                value = (value + 4) / 8
+    def render(self, canvas) -> None:
+        value = self.sin_field * math.cos(self.time) + self.cos_field * math.sin(self.time)
+        value = (value + 4) / 8
 
-                r, g, b = self._value_to_color(value)
-                canvas.SetPixel(x, y, r, g, b)
+        hue_index = (np.mod(value, 1.0) * len(HUE_WHEEL)).astype(np.intp)
+        np.clip(hue_index, 0, len(HUE_WHEEL) - 1, out=hue_index)
+        self.frame.pixels[...] = self.palette[hue_index]
+        self.frame.flush(canvas)
 
         self.time += 0.1
 
-    def _value_to_color(self, value):
-        hue = value % 1.0
-        r, g, b = self._hsv_to_rgb(hue, 1.0, 1.0)
-        return r, g, b
-
-    def _hsv_to_rgb(self, h, s, v):
-        if s == 0.0:
-            return int(v * 255), int(v * 255), int(v * 255)
-        i = int(h * 6.0)
-        f = (h * 6.0) - i
-        p = v * (1.0 - s)
-        q = v * (1.0 - s * f)
-        t = v * (1.0 - s * (1.0 - f))
-        i = i % 6
-        if i == 0:
-            return int(v * 255), int(t * 255), int(p * 255)
-        if i == 1:
-            return int(q * 255), int(v * 255), int(p * 255)
-        if i == 2:
-            return int(p * 255), int(v * 255), int(t * 255)
-        if i == 3:
-            return int(p * 255), int(q * 255), int(v * 255)
-        if i == 4:
-            return int(t * 255), int(p * 255), int(v * 255)
-        return int(v * 255), int(p * 255), int(q * 255)
 
+class LifeBoard:
+    """Toroidal Game of Life board stepped with whole-array neighbour sums.
 
-class ConwayLifeScene(Scene):
-    def __init__(self):
-        self.grid = [[random.choice([0, 1]) for _ in range(64)] for _ in range(32)]
+    Recent generations are remembered by hash so still lifes and short
+    oscillators are spotted as soon as the board repeats itself.
+    """
+
+    def __init__(self, width: int = 64, height: int = 32, history: int = 16):
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng()
+        self.history = deque(maxlen=history)
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+        self.generation = 0
+
+    def seed(self, density: float = 0.5):
+        self.cells = (self.rng.random((self.height, self.width)) < density).astype(
+            np.uint8
+        )
+        self.history.clear()
+        self.history.append(hash(self.cells.tobytes()))
         self.generation = 0
+
+    def step(self) -> bool:
+        """Advance one generation, returning False once the board has started repeating"""
+        cells = self.cells
+        # Neighbour count is separable: sum each column triple, then each row triple
+        columns = cells + np.roll(cells, 1, axis=0) + np.roll(cells, -1, axis=0)
+        neighbors = columns + np.roll(columns, 1, axis=1) + np.roll(columns, -1, axis=1)
+        neighbors -= cells
+
+        self.cells = ((neighbors == 3) | ((cells == 1) & (neighbors == 2))).astype(
+            np.uint8
+        )
+        self.generation += 1
+
+        digest = hash(self.cells.tobytes())
+        repeated = digest in self.history
+        self.history.append(digest)
+        return not repeated
+
+
+class ConwayLifeScene(Scene):
+    # Long-running boards (e.g. gliders wandering through debris) still get reseeded
+    MAX_GENERATIONS = 1000
+
+    def __init__(self, width: int = 64, height: int = 32):
+        self.board = LifeBoard(width, height)
+        self.board.seed()
+        self.frame = FrameBuffer(width, height)
+        self.palette = np.array([(0, 0, 0), (0, 255, 0)], dtype=np.uint8)
         self.last_update = time.time()
 
     def render(self, canvas) -> None:
-        canvas.Clear()
-
         # Draw current generation
-        for y in range(32):
-            for x in range(64):
-                if self.grid[y][x]:
-                    canvas.SetPixel(x, y, 0, 255, 0)
+        self.frame.pixels[...] = self.palette[self.board.cells]
+        self.frame.flush(canvas)
 
         # Update every 0.2 seconds
         if time.time() - self.last_update > 0.2:
-            self._next_generation()
+            evolving = self.board.step()
             self.last_update = time.time()
-            self.generation += 1
-
-            # Reset if stagnant (every 200 generations)
-            if self.generation > 200:
-                self.grid = [
-                    [random.choice([0, 1]) for _ in range(64)] for _ in range(32)
-                ]
-                self.generation = 0
-
-    def _next_generation(self):
-        new_grid = [[0 for _ in range(64)] for _ in range(32)]
-
-        for y in range(32):
-            for x in range(64):
-                neighbors = self._count_neighbors(x, y)
-
-                if self.grid[y][x]:
-                    # Cell is alive
-                    if neighbors in [2, 3]:
-                        new_grid[y][x] = 1
-                else:
-                    # Cell is dead
-                    if neighbors == 3:
-                        new_grid[y][x] = 1
-
-        self.grid = new_grid
-
-    def _count_neighbors(self, x, y):
-        count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx = (x + dx) % 64
-                ny = (y + dy) % 32
-                count += self.grid[ny][nx]
-        return count
+
+            # Reseed as soon as the board settles or cycles
+            if not evolving or self.board.generation > self.MAX_GENERATIONS:
+                self.board.seed()
 
 
 class ScreensaverManager(Scene):
@@ -6,100 +6,258 @@ from typing import Optional
 
 from appkit.base import Application, Scene, ApplicationConfig
 from appkit.config import Config
+from appkit.framebuffer import FrameBuffer
 from appkit.graphics_helpers import Color, Font, draw_text
 from tfeos.input import InputType, InputResult
 
 
-class SnakeScene(Scene):
-    def __init__(self, application_config):
-        self.config = application_config.config
-        self.app_dir = application_config.app_dir
-
-        self.reset_game()
-        font_path = self.app_dir / "resources" / "4x6.bdf"
-        self.font = Font(str(font_path))
+class FreeCells:
+    """Indexed set of free board cells with O(1) add, remove and random pick"""
+
+    def __init__(self, size: int):
+        self.cells = list(range(size))
+        self.positions = list(range(size))
+        self.count = size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def remove(self, cell: int):
+        # Swap the cell with the last free one, then shrink the free region
+        pos = self.positions[cell]
+        last = self.cells[self.count - 1]
+        self.cells[pos] = last
+        self.positions[last] = pos
+        self.cells[self.count - 1] = cell
+        self.positions[cell] = self.count - 1
+        self.count -= 1
+
+    def add(self, cell: int):
+        pos = self.positions[cell]
+        first_used = self.cells[self.count]
+        self.cells[pos] = first_used
+        self.positions[first_used] = pos
+        self.cells[self.count] = cell
+        self.positions[cell] = self.count
+        self.count += 1
+
+    def pick(self, rng: random.Random) -> int:
+        return self.cells[rng.randrange(self.count)]
+
+
+class SnakeGame:
+    """Snake rules and board state, independent of any canvas.
+
+    An occupancy bitmap mirrors the snake deque so collision checks and food
+    spawns stay constant time all the way to a full board.
+    """
+
+    def __init__(self, width: int = 64, height: int = 32, seed: Optional[int] = None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        x, y = self.width // 2, self.height // 2
+        self.snake = deque([(x, y), (x - 1, y), (x - 2, y)])
+        self.occupied = bytearray(self.width * self.height)
+        self.free_cells = FreeCells(self.width * self.height)
+        # Cells whose contents changed since the renderer last looked
+        self.changed_cells = []
+        for segment in self.snake:
+            self._occupy(segment)
 
-    def reset_game(self):
-        self.snake = deque([(32, 16), (31, 16), (30, 16)])
         self.direction = (1, 0)
         self.next_direction = (1, 0)
         self.food = self._spawn_food()
         self.game_over = False
         self.won = False
-        self.last_move = time.time()
-        self.move_delay = 0.15
 
-    def _spawn_food(self):
-        while True:
-            food = (random.randint(0, 63), random.randint(0, 31))
-            if food not in self.snake:
-                return food
+    @property
+    def score(self) -> int:
+        return len(self.snake) - 3
 
-    def render(self, canvas) -> None:
-        canvas.Clear()
+    def _occupy(self, cell):
+        index = cell[1] * self.width + cell[0]
+        self.occupied[index] = 1
+        self.free_cells.remove(index)
+        self.changed_cells.append(cell)
 
-        # Draw background (light brown)
-        for y in range(32):
-            for x in range(64):
-                canvas.SetPixel(x, y, 101, 67, 33)
+    def _vacate(self, cell):
+        index = cell[1] * self.width + cell[0]
+        self.occupied[index] = 0
+        self.free_cells.add(index)
+        self.changed_cells.append(cell)
 
-        # Draw score
-        score = len(self.snake) - 3
-        if score > 999:
-            draw_text(canvas, self.font, 64 - 20, 5, Color(255, 255, 255), str(score))
-        elif score > 99:
-            draw_text(canvas, self.font, 64 - 15, 5, Color(255, 255, 255), str(score))
-        elif score > 9:
-            draw_text(canvas, self.font, 64 - 10, 5, Color(255, 255, 255), str(score))
-        else:
-            draw_text(canvas, self.font, 64 - 5, 5, Color(255, 255, 255), str(score))
-
-        # Draw snake (green)
-        for segment in self.snake:
-            canvas.SetPixel(segment[0], segment[1], 0, 255, 0)
-
-        # Draw food (red)
-        canvas.SetPixel(self.food[0], self.food[1], 255, 0, 0)
-
-        # Game logic
-        if not self.game_over and not self.won:
-            if time.time() - self.last_move > self.move_delay:
-                self._move_snake()
-                self.last_move = time.time()
-
-        # Draw game over/win message
-        if self.game_over:
-            self._draw_text_overlay(canvas, "GAME", "OVER")
-        elif self.won:
-            self._draw_text_overlay(canvas, "YOU", "WIN!")
+    def _spawn_food(self):
+        if not self.free_cells:
+            return None
+        index = self.free_cells.pick(self.rng)
+        return (index % self.width, index // self.width)
 
-    def _move_snake(self):
+    def move(self):
         self.direction = self.next_direction
 
         head = self.snake[0]
         new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
 
         # Check collision with walls
-        if new_head[0] < 0 or new_head[0] >= 64 or new_head[1] < 0 or new_head[1] >= 32:
+        if (
+            new_head[0] < 0
+            or new_head[0] >= self.width
+            or new_head[1] < 0
+            or new_head[1] >= self.height
+        ):
             self.game_over = True
             return
 
         # Check collision with self
-        if new_head in self.snake:
+        if self.occupied[new_head[1] * self.width + new_head[0]]:
             self.game_over = True
             return
 
         self.snake.appendleft(new_head)
+        self._occupy(new_head)
 
         # Check if ate food
         if new_head == self.food:
-            # Check if won (2048 segments)
-            if len(self.snake) >= 2048:
+            # Check if won (every cell filled, 2048 segments on a 64x32 board)
+            if len(self.snake) >= self.width * self.height:
                 self.won = True
                 return
             self.food = self._spawn_food()
+            self.changed_cells.append(self.food)
         else:
-            self.snake.pop()
+            self._vacate(self.snake.pop())
+
+    def autopilot_direction(self):
+        """Direction along a Hamiltonian cycle of the board, used for headless runs.
+
+        Row 0 runs right, the remaining rows snake between columns 1 and
+        width - 1, and column 0 leads back up to the top. Needs an even height.
+        A snake starting on an odd row faces against the cycle, so it first
+        steps onto a neighbouring row that runs its way.
+        """
+        x, y = self.snake[0]
+        if x == 0:
+            return (0, -1) if y > 0 else (1, 0)
+        if y % 2 == 0:
+            return (1, 0) if x < self.width - 1 else (0, 1)
+        if self.direction == (1, 0):
+            return (0, 1) if y < self.height - 1 else (0, -1)
+        if y == self.height - 1:
+            return (-1, 0)
+        return (-1, 0) if x > 1 else (0, 1)
+
+
+def run_headless(
+    seed: Optional[int] = None,
+    max_moves: int = 5_000_000,
+    width: int = 64,
+    height: int = 32,
+) -> dict:
+    """Play a seeded game on the autopilot without rendering, for benchmarking"""
+    if height % 2 or width < 4:
+        raise ValueError(
+            f"Autopilot needs an even height and a width of at least 4, got {width}x{height}"
+        )
+    game = SnakeGame(width, height, seed)
+    started = time.perf_counter()
+    moves = 0
+    while moves < max_moves and not (game.game_over or game.won):
+        game.next_direction = game.autopilot_direction()
+        game.move()
+        game.changed_cells.clear()
+        moves += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "moves": moves,
+        "score": game.score,
+        "won": game.won,
+        "game_over": game.game_over,
+        "seconds": elapsed,
+        "moves_per_second": moves / elapsed if elapsed else 0.0,
+    }
+
+
+class SnakeScene(Scene):
+    background_colour = (101, 67, 33)
+    snake_colour = (0, 255, 0)
+    food_colour = (255, 0, 0)
+
+    def __init__(self, application_config):
+        self.config = application_config.config
+        self.app_dir = application_config.app_dir
+
+        self.game = SnakeGame()
+        # Static background layer, copied into the frame in one operation
+        self.background = FrameBuffer(self.game.width, self.game.height)
+        self.background.fill(self.background_colour)
+        self.frame = FrameBuffer(self.game.width, self.game.height)
+
+        self.reset_game()
+        font_path = self.app_dir / "resources" / "4x6.bdf"
+        self.font = Font(str(font_path))
+
+    def reset_game(self):
+        self.game.reset()
+        self.last_move = time.time()
+        self.move_delay = 0.15
+        self._redraw_board()
+
+    def _redraw_board(self):
+        """Repaint the whole frame from the background layer and current game state"""
+        game = self.game
+        self.frame.buffer[...] = self.background.buffer
+        for x, y in game.snake:
+            self.frame.pixels[y, x] = self.snake_colour
+        if game.food:
+            self.frame.pixels[game.food[1], game.food[0]] = self.food_colour
+        game.changed_cells.clear()
+
+    def _update_changed_cells(self):
+        game = self.game
+        pixels = self.frame.pixels
+        for x, y in game.changed_cells:
+            if game.occupied[y * game.width + x]:
+                pixels[y, x] = self.snake_colour
+            elif (x, y) == game.food:
+                pixels[y, x] = self.food_colour
+            else:
+                pixels[y, x] = self.background.pixels[y, x]
+        game.changed_cells.clear()
+
+    def render(self, canvas) -> None:
+        game = self.game
+
+        # Game logic
+        if not game.game_over and not game.won:
+            if time.time() - self.last_move > self.move_delay:
+                game.move()
+                self.last_move = time.time()
+
+        # Only cells touched by the last move are repainted before the blit
+        self._update_changed_cells()
+        self.frame.flush(canvas)
+
+        # Draw score
+        score = game.score
+        if score > 999:
+            draw_text(canvas, self.font, 64 - 20, 5, Color(255, 255, 255), str(score))
+        elif score > 99:
+            draw_text(canvas, self.font, 64 - 15, 5, Color(255, 255, 255), str(score))
+        elif score > 9:
+            draw_text(canvas, self.font, 64 - 10, 5, Color(255, 255, 255), str(score))
+        else:
+            draw_text(canvas, self.font, 64 - 5, 5, Color(255, 255, 255), str(score))
+
+        # Draw game over/win message
+        if game.game_over:
+            self._draw_text_overlay(canvas, "GAME", "OVER")
+        elif game.won:
+            self._draw_text_overlay(canvas, "YOU", "WIN!")
 
     def _draw_text_overlay(self, canvas, line1, line2):
         # Draw text (simplified - just show the message centered)
@@ -260,20 +418,21 @@ class SnakeScene(Scene):
                 canvas.SetPixel(x + px, y + py, 255, 255, 255)
 
     def handle_input(self, input_type: InputType):
-        if self.game_over or self.won:
+        game = self.game
+        if game.game_over or game.won:
             if input_type == InputType.ACCEPT:
                 self.reset_game()
             return None
 
         # Change direction (can't reverse)
-        if input_type == InputType.UP and self.direction != (0, 1):
-            self.next_direction = (0, -1)
-        elif input_type == InputType.DOWN and self.direction != (0, -1):
-            self.next_direction = (0, 1)
-        elif input_type == InputType.LEFT and self.direction != (1, 0):
-            self.next_direction = (-1, 0)
-        elif input_type == InputType.RIGHT and self.direction != (-1, 0):
-            self.next_direction = (1, 0)
+        if input_type == InputType.UP and game.direction != (0, 1):
+            game.next_direction = (0, -1)
+        elif input_type == InputType.DOWN and game.direction != (0, -1):
+            game.next_direction = (0, 1)
+        elif input_type == InputType.LEFT and game.direction != (1, 0):
+            game.next_direction = (-1, 0)
+        elif input_type == InputType.RIGHT and game.direction != (-1, 0):
+            game.next_direction = (1, 0)
 
         return None
 
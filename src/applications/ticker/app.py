@@ -1,84 +1,282 @@
 import time
 from pathlib import Path
-from threading import Lock, Thread
-from typing import Optional
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
 
-import requests
+import numpy as np
 
 from appkit.base import Application, Scene, ApplicationConfig
 from appkit.config import Config
 from appkit.graphics_helpers import Color, Font, draw_text
+from appkit.store import ResponseStore
 from tfeos.input import InputType, InputResult
 
 import logging
 
 logger = logging.getLogger(__name__)
+
+YAHOO_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+# Symbols per Yahoo spark request, and requests allowed in flight at once.
+YAHOO_BATCH_SIZE = 20
+MAX_CONCURRENT_REQUESTS = 4
+
+# Samples kept per symbol, a day of 5 minute intraday data.
+HISTORY_LENGTH = 288
+SPARKLINE_TOP = 11
+SPARKLINE_HEIGHT = 21
+
+
+class PriceHistory:
+    """Fixed-size ring buffer of (timestamp, price) samples for one symbol.
+
+    Samples that aren't newer than the last one are dropped, so re-fetching a
+    quote that hasn't changed (e.g. overnight) doesn't flatten the history.
+    """
+
+    def __init__(self, capacity: int = HISTORY_LENGTH):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float32)
+        self.start = 0
+        self.count = 0
+        self.version = 0  # Bumped on every change, so renderers know to redraw.
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, price: float):
+        if self.count:
+            last = (self.start + self.count - 1) % self.capacity
+            if timestamp <= self.times[last]:
+                return
+
+        index = (self.start + self.count) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+        self.times[index] = timestamp
+        self.prices[index] = price
+        self.version += 1
+
+    def extend(self, timestamps, prices):
+        for timestamp, price in zip(timestamps, prices):
+            if price is not None:
+                self.append(timestamp, price)
+
+    def ordered_prices(self) -> np.ndarray:
+        """Copy of the prices, oldest first"""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.prices[self.start : end].copy()
+        return np.concatenate(
+            (self.prices[self.start :], self.prices[: end - self.capacity])
+        )
+
+
 class TickerData:
-    def __init__(self):
+    """Latest quote per symbol, refreshed in batches.
+
+    Crypto prices come from a single CoinGecko call and stocks from Yahoo spark
+    requests of up to YAHOO_BATCH_SIZE symbols each, with a chart request for
+    anything a batch leaves out. Requests run on the shared fetch loop, at most
+    MAX_CONCURRENT_REQUESTS at a time, and the new quotes replace the old ones
+    in one locked swap.
+
+    Each symbol also gets a PriceHistory, seeded with intraday data the first
+    time it's fetched and extended with every refresh after that.
+    """
+
+    def __init__(self, http, fetch_loop):
+        self.http = http
+        self.fetch_loop = fetch_loop
         self.tickers = {}
         self.lock = Lock()
         self.last_update = 0
+        self.history: Dict[str, PriceHistory] = {}
+        self.watched = set()
+
+    def set_watchlist(
+        self, symbols: List[str], crypto_symbols: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """Track a new watchlist and drop quotes and history for symbols no longer on it.
 
-    def update_ticker(self, symbol: str, is_crypto: bool = False):
-        try:
-            if is_crypto:
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol}&vs_currencies=usd&include_24hr_change=true"
-                response = requests.get(url, timeout=5)
-                data = response.json()
-
-                if symbol in data:
-                    price = data[symbol]["usd"]
-                    change = data[symbol].get("usd_24h_change", 0)
-
-                    with self.lock:
-                        self.tickers[symbol] = {
-                            "price": price,
-                            "change": change,
-                            "is_crypto": True,
-                        }
+        Returns the (stock, crypto) symbols that weren't being watched before.
+        """
+        with self.lock:
+            added = (
+                [s for s in symbols if s not in self.watched],
+                [s for s in crypto_symbols if s not in self.watched],
+            )
+            self.watched = set(symbols) | set(crypto_symbols)
+            self.tickers = {
+                s: quote for s, quote in self.tickers.items() if s in self.watched
+            }
+            for symbol in [s for s in self.history if s not in self.watched]:
+                del self.history[symbol]
+        return added
+
+    def update(self, symbols: List[str], crypto_symbols: List[str]):
+        with self.lock:
+            unseeded = {s for s in symbols + crypto_symbols if not self.history.get(s)}
+
+        requests = []
+        if crypto_symbols:
+            requests.append((self._fetch_crypto, (crypto_symbols,)))
+        for symbol in unseeded.intersection(crypto_symbols):
+            requests.append((self._fetch_crypto_history, (symbol,)))
+        for seed in (True, False):
+            group = [s for s in symbols if (s in unseeded) == seed]
+            for i in range(0, len(group), YAHOO_BATCH_SIZE):
+                batch = group[i : i + YAHOO_BATCH_SIZE]
+                requests.append((self._fetch_stock_batch, (batch, seed)))
+        quotes = self._collect(requests)
+
+        # Symbols the batch endpoint didn't return get one chart request each.
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if missing:
+            quotes.update(
+                self._collect(
+                    [(self._fetch_stock, (s, s in unseeded)) for s in missing]
+                )
+            )
+
+        now = time.time()
+        with self.lock:
+            # The watchlist may have changed while these were in flight.
+            quotes = {s: quote for s, quote in quotes.items() if s in self.watched}
+            for symbol, quote in quotes.items():
+                self._history_for(symbol).append(
+                    quote.get("updated_at") or now, quote["price"]
+                )
+            self.tickers = {**self.tickers, **quotes}
+            self.last_update = now
+
+    def _history_for(self, symbol: str) -> PriceHistory:
+        history = self.history.get(symbol)
+        if history is None:
+            history = self.history[symbol] = PriceHistory()
+        return history
+
+    def _seed(self, symbol: str, timestamps, prices):
+        with self.lock:
+            if symbol in self.watched:
+                self._history_for(symbol).extend(timestamps, prices)
+
+    def _seed_from_chart(self, symbol: str, result: dict):
+        """Seed history from a Yahoo chart/spark result with intraday data"""
+        closes = result.get("indicators", {}).get("quote", [{}])[0].get("close")
+        if result.get("timestamp") and closes:
+            self._seed(symbol, result["timestamp"], closes)
+
+    def _collect(self, requests: List[Tuple[Callable, tuple]]) -> Dict[str, dict]:
+        quotes = {}
+        for result in self.fetch_loop.run_batch(requests, MAX_CONCURRENT_REQUESTS):
+            if isinstance(result, Exception):
+                logger.error(f"Error updating tickers: {result}", exc_info=result)
             else:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-                response = requests.get(url, headers=headers, timeout=5)
-
-                if response.status_code != 200:
-                    logger.error(
-                        f"Yahoo Finance returned status {response.status_code} for {symbol}"
-                    )
-                    return
-
-                data = response.json()
-
-                if (
-                    "chart" in data
-                    and "result" in data["chart"]
-                    and len(data["chart"]["result"]) > 0
-                ):
-                    result = data["chart"]["result"][0]
-                    meta = result["meta"]
-                    price = meta["regularMarketPrice"]
-                    prev_close = meta["chartPreviousClose"]
-                    if prev_close != 0:
-                        change = ((price - prev_close) / prev_close) * 100
-                    else:
-                        change = 0 # weekends
-                    
-
-                    with self.lock:
-                        self.tickers[symbol] = {
-                            "price": price,
-                            "change": change,
-                            "is_crypto": False,
-                        }
-        except Exception as e:
-            logger.exception(f"Error updating {symbol}: {e}")
+                quotes.update(result)
+        return quotes
+
+    def _fetch_crypto(self, ids: List[str]) -> Dict[str, dict]:
+        url = f"https://api.coingecko.com/api/v3/simple/price?ids={','.join(ids)}&vs_currencies=usd&include_24hr_change=true&include_last_updated_at=true"
+        data = self.http.get(url, timeout=5).json()
+
+        return {
+            symbol: {
+                "price": data[symbol]["usd"],
+                "change": data[symbol].get("usd_24h_change", 0),
+                "is_crypto": True,
+                "updated_at": data[symbol].get("last_updated_at"),
+            }
+            for symbol in ids
+            if symbol in data
+        }
+
+    def _fetch_crypto_history(self, symbol: str) -> Dict[str, dict]:
+        url = f"https://api.coingecko.com/api/v3/coins/{symbol}/market_chart?vs_currency=usd&days=1"
+        data = self.http.get(url, timeout=5).json()
+
+        # Prices come as [milliseconds, price] pairs.
+        prices = data.get("prices") or []
+        self._seed(symbol, [t / 1000 for t, _ in prices], [p for _, p in prices])
+        return {}
+
+    def _fetch_stock_batch(self, symbols: List[str], seed: bool) -> Dict[str, dict]:
+        interval = "5m" if seed else "1d"
+        url = f"https://query1.finance.yahoo.com/v7/finance/spark?symbols={','.join(symbols)}&range=1d&interval={interval}"
+        response = self.http.get(url, headers=YAHOO_HEADERS, timeout=5)
+
+        if response.status_code != 200:
+            logger.warning(
+                f"Yahoo Finance spark returned status {response.status_code} for {len(symbols)} symbols"
+            )
+            return {}
+
+        quotes = {}
+        for result in response.json().get("spark", {}).get("result") or []:
+            symbol = result.get("symbol")
+            if symbol in symbols and result.get("response"):
+                if seed:
+                    self._seed_from_chart(symbol, result["response"][0])
+                quotes[symbol] = self._stock_quote(result["response"][0]["meta"])
+        return quotes
+
+    def _fetch_stock(self, symbol: str, seed: bool) -> Dict[str, dict]:
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+        if seed:
+            url += "?range=1d&interval=5m"
+        response = self.http.get(url, headers=YAHOO_HEADERS, timeout=5)
+
+        if response.status_code != 200:
+            logger.error(
+                f"Yahoo Finance returned status {response.status_code} for {symbol}"
+            )
+            return {}
+
+        data = response.json()
+
+        if (
+            "chart" in data
+            and "result" in data["chart"]
+            and len(data["chart"]["result"]) > 0
+        ):
+            result = data["chart"]["result"][0]
+            if seed:
+                self._seed_from_chart(symbol, result)
+            return {symbol: self._stock_quote(result["meta"])}
+        return {}
+
+    def _stock_quote(self, meta: dict) -> dict:
+        price = meta["regularMarketPrice"]
+        prev_close = meta["chartPreviousClose"]
+        if prev_close != 0:
+            change = ((price - prev_close) / prev_close) * 100
+        else:
+            change = 0 # weekends
+
+        return {
+            "price": price,
+            "change": change,
+            "is_crypto": False,
+            "updated_at": meta.get("regularMarketTime"),
+        }
 
     def get_ticker(self, symbol: str):
         with self.lock:
             return self.tickers.get(symbol)
 
+    def get_history_version(self, symbol: str) -> int:
+        history = self.history.get(symbol)
+        return history.version if history else 0
+
+    def get_history_prices(self, symbol: str) -> Optional[np.ndarray]:
+        with self.lock:
+            history = self.history.get(symbol)
+            return history.ordered_prices() if history else None
+
 
 class TickerScene(Scene):
     def __init__(self, application_config):
@@ -87,40 +285,83 @@ class TickerScene(Scene):
 
         font_path = self.app_dir / "resources" / "5x7.bdf"
         self.font = Font(str(font_path))
-        self.ticker_data = TickerData()
+        self.fetch_loop = application_config.fetch_loop
+        self.ticker_data = TickerData(application_config.http, self.fetch_loop)
+        self.store = ResponseStore(self.app_dir)
         self.current_index = 0
-        self.update_thread = None
-        self.running = True
         self.last_switch = time.time()
 
-        self.start_updates()
-
-    def start_updates(self):
-        self.update_thread = Thread(target=self._update_loop, daemon=True)
-        self.update_thread.start()
-
-    def _update_loop(self):
-        while self.running:
-            symbols = self.config.get("symbols", [])
-            crypto_symbols = self.config.get("crypto_symbols", [])
+        # Rotation order as (symbol, is_crypto), rebuilt only when the config changes.
+        self.symbols = []
+        self.crypto_symbols = []
+        self.all_symbols = []
+
+        # Pixels of the current symbol's sparkline, rebuilt only when its history changes.
+        self.sparkline_key = None
+        self.sparkline_pixels = []
+        self.sparkline_colour = (0, 255, 0)
+
+        self._load_stored_tickers()
+        self._reconcile(self.config)
+        self.update_job = self.fetch_loop.schedule(
+            "TickerUpdate", self._update_tickers, interval=60
+        )
+
+    def stop(self):
+        self.update_job.cancel()
+
+    def _load_stored_tickers(self):
+        """Show the last known prices until the first update comes back"""
+        stored = self.store.load(("tickers",))
+        if stored:
+            tickers, fetched_at = stored
+            with self.ticker_data.lock:
+                self.ticker_data.tickers = tickers
+                self.ticker_data.last_update = fetched_at
 
-            for symbol in symbols:
-                self.ticker_data.update_ticker(symbol, is_crypto=False)
-
-            for symbol in crypto_symbols:
-                self.ticker_data.update_ticker(symbol, is_crypto=True)
-
-            time.sleep(60)
+    def handle_new_config(self, new_config: Config):
+        added_symbols, added_crypto = self._reconcile(new_config)
+        if added_symbols or added_crypto:
+            self.fetch_loop.submit(self._update_tickers, added_symbols, added_crypto)
+
+    def _reconcile(self, config: Config) -> Tuple[List[str], List[str]]:
+        """Apply a config's watchlist, returning the (stock, crypto) symbols it adds"""
+        self.config = config
+        symbols = list(config.get("symbols", []))
+        crypto_symbols = list(config.get("crypto_symbols", []))
+        added = self.ticker_data.set_watchlist(symbols, crypto_symbols)
+
+        # Stay on the symbol being shown if it survived the edit.
+        current = self.all_symbols[self.current_index] if self.all_symbols else None
+        all_symbols = [(s, False) for s in symbols] + [(s, True) for s in crypto_symbols]
+        self.current_index = all_symbols.index(current) if current in all_symbols else 0
+        self.symbols = symbols
+        self.crypto_symbols = crypto_symbols
+        self.all_symbols = all_symbols
+        self.sparkline_key = None
+
+        self.show_sparkline = config.get("display_mode", "Price") == "Sparkline"
+        return added
+
+    def _update_tickers(
+        self,
+        symbols: Optional[List[str]] = None,
+        crypto_symbols: Optional[List[str]] = None,
+    ):
+        if symbols is None and crypto_symbols is None:
+            symbols, crypto_symbols = self.symbols, self.crypto_symbols
+
+        self.ticker_data.update(symbols or [], crypto_symbols or [])
+
+        with self.ticker_data.lock:
+            tickers = self.ticker_data.tickers
+            last_update = self.ticker_data.last_update
+        self.store.save(("tickers",), tickers, last_update)
 
     def render(self, canvas) -> None:
         canvas.Clear()
 
-        symbols = self.config.get("symbols", [])
-        crypto_symbols = self.config.get("crypto_symbols", [])
-        all_symbols = [(s, False) for s in symbols] + [
-            (s, True) for s in crypto_symbols
-        ]
-
+        all_symbols = self.all_symbols
         if not all_symbols:
             draw_text(canvas, self.font, 2, 10, Color(255, 255, 255), "No tickers")
             return
@@ -150,9 +391,14 @@ class TickerScene(Scene):
             else:
                 color = Color(255, 0, 0)
 
-            draw_text(canvas, self.font, 2, 8, Color(255, 255, 255), display_symbol)
-            draw_text(canvas, self.font, 2, 16, color, price_str)
-            draw_text(canvas, self.font, 2, 24, color, change_str)
+            if self.show_sparkline:
+                draw_text(canvas, self.font, 2, 8, Color(255, 255, 255), display_symbol)
+                draw_text(canvas, self.font, 63 - len(change_str) * 5, 8, color, change_str)
+                self._draw_sparkline(canvas, symbol)
+            else:
+                draw_text(canvas, self.font, 2, 8, Color(255, 255, 255), display_symbol)
+                draw_text(canvas, self.font, 2, 16, color, price_str)
+                draw_text(canvas, self.font, 2, 24, color, change_str)
 
             if time.time() - self.last_switch > 3:
                 self.current_index = (self.current_index + 1) % len(all_symbols)
@@ -160,22 +406,50 @@ class TickerScene(Scene):
         else:
             draw_text(canvas, self.font, 2, 16, Color(255, 255, 0), f"Loading...")
 
+    def _draw_sparkline(self, canvas, symbol: str):
+        key = (symbol, self.ticker_data.get_history_version(symbol))
+        if key != self.sparkline_key:
+            self._build_sparkline(symbol)
+            self.sparkline_key = key
+
+        r, g, b = self.sparkline_colour
+        for x, y in self.sparkline_pixels:
+            canvas.SetPixel(x, y, r, g, b)
+
+    def _build_sparkline(self, symbol: str):
+        """Downsample the whole history to at most 64 columns and scale it into a line of pixels"""
+        self.sparkline_pixels = []
+        prices = self.ticker_data.get_history_prices(symbol)
+        if prices is None or len(prices) < 2:
+            return
+
+        columns = min(len(prices), 64)
+        samples = prices[np.linspace(0, len(prices) - 1, columns).astype(int)]
+        low, high = samples.min(), samples.max()
+        bottom = SPARKLINE_TOP + SPARKLINE_HEIGHT - 1
+        if high > low:
+            scaled = (samples - low) / (high - low) * (SPARKLINE_HEIGHT - 1)
+        else:
+            scaled = np.full(columns, (SPARKLINE_HEIGHT - 1) / 2)
+        ys = (bottom - np.round(scaled)).astype(int).tolist()
+
+        # Fill the gap between neighbouring points so steep moves stay connected.
+        x_offset = 64 - columns
+        for i, y in enumerate(ys):
+            prev_y = ys[i - 1] if i else y
+            for fill_y in range(min(y, prev_y), max(y, prev_y) + 1):
+                self.sparkline_pixels.append((x_offset + i, fill_y))
+
+        self.sparkline_colour = (0, 255, 0) if samples[-1] >= samples[0] else (255, 0, 0)
+
     def handle_input(self, input_type: InputType):
-        if input_type == InputType.RIGHT:
-            symbols = self.config.get("symbols", [])
-            crypto_symbols = self.config.get("crypto_symbols", [])
-            all_symbols = [(s, False) for s in symbols] + [
-                (s, True) for s in crypto_symbols
-            ]
-            self.current_index = (self.current_index + 1) % len(all_symbols)
+        if input_type == InputType.ACCEPT:
+            self.show_sparkline = not self.show_sparkline
+        elif input_type == InputType.RIGHT and self.all_symbols:
+            self.current_index = (self.current_index + 1) % len(self.all_symbols)
             self.last_switch = time.time()
-        elif input_type == InputType.LEFT:
-            symbols = self.config.get("symbols", [])
-            crypto_symbols = self.config.get("crypto_symbols", [])
-            all_symbols = [(s, False) for s in symbols] + [
-                (s, True) for s in crypto_symbols
-            ]
-            self.current_index = (self.current_index - 1) % len(all_symbols)
+        elif input_type == InputType.LEFT and self.all_symbols:
+            self.current_index = (self.current_index - 1) % len(self.all_symbols)
             self.last_switch = time.time()
         return None
 
@@ -187,7 +461,7 @@ class App(Application):
         self.scene = self.scenes["ticker"]
 
     def cleanup(self):
-        self.scene.running = False
+        self.scene.stop()
 
     def get_framerate(self) -> int:
         return 10
@@ -199,4 +473,4 @@ class App(Application):
         self.scene.handle_input(input_type)
 
     def handle_new_config(self, new_config: Config):
-        return
\ No newline at end of file
+        self.scene.handle_new_config(new_config)
\ No newline at end of file
@@ -1,55 +1,165 @@
+import logging
 import time
 from pathlib import Path
-from threading import Lock, Thread
-from typing import Optional
+from threading import Lock
+from typing import List, Optional, Tuple
 
-import requests
+import numpy as np
 
 from appkit.base import Application, Scene, ApplicationConfig
 from appkit.config import Config
 from appkit.graphics_helpers import Color, Font, draw_text
+from appkit.store import ResponseStore
 from tfeos.input import InputType, InputResult
 
+logger = logging.getLogger(__name__)
+
+
+# Seconds each location stays on the panel when showing several.
+ROTATION_SECONDS = 5
+# The hourly series covers today and tomorrow, so it only needs an occasional refresh.
+FORECAST_DAYS = 2
+FORECAST_REFRESH = 6 * 60 * 60
+# Forecast view: hours shown, pixels per hour column and scroll speed in pixels per second.
+FORECAST_HOURS = 24
+FORECAST_COLUMN_WIDTH = 32
+FORECAST_SCROLL_SPEED = 10
+
+
+class HourlyForecast:
+    """Hourly temperatures and weather codes for one location, indexed by hours since `start`"""
+
+    __slots__ = ("location", "unit", "start", "temps", "codes")
+
+    def __init__(self, location: str, unit: str, start: float, temps, codes):
+        self.location = location
+        self.unit = unit
+        self.start = start  # Unix time of the first hour.
+        self.temps = np.asarray(temps, dtype=np.float32)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+
+    def at(self, timestamp: float) -> Optional[Tuple[float, int]]:
+        """Temperature interpolated between the surrounding hours, and that hour's weather code"""
+        position = max((timestamp - self.start) / 3600, 0.0)
+        hour = int(position)
+        if hour >= len(self.temps):
+            return None  # Past the end of the series, wait for a refresh.
+        if hour == len(self.temps) - 1:
+            return float(self.temps[hour]), int(self.codes[hour])
+
+        fraction = position - hour
+        temp = self.temps[hour] + (self.temps[hour + 1] - self.temps[hour]) * fraction
+        return float(temp), int(self.codes[hour])
+
+    def hour_index(self, timestamp: float) -> int:
+        return int((timestamp - self.start) // 3600)
+
+    def to_dict(self) -> dict:
+        return {
+            "location": self.location,
+            "unit": self.unit,
+            "start": self.start,
+            "temps": self.temps.tolist(),
+            "codes": self.codes.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HourlyForecast":
+        return cls(**data)
+
+
+class GeocodeCache:
+    """Location name to (latitude, longitude), kept on disk since places don't move"""
+
+    def __init__(self, http, store: ResponseStore):
+        self.http = http
+        self.store = store
+        self.lock = Lock()
+        stored = store.load(("geocode",))
+        self.coordinates = stored[0] if stored else {}
+
+    def lookup(self, location: str) -> Optional[Tuple[float, float]]:
+        key = location.strip().lower()
+        with self.lock:
+            if key in self.coordinates:
+                return tuple(self.coordinates[key])
+
+        geocode_url = "https://geocoding-api.open-meteo.com/v1/search"
+        geo_response = self.http.get(
+            geocode_url, params={"name": location, "count": 1}, timeout=5
+        )
+        geo_data = geo_response.json()
+
+        if "results" not in geo_data or len(geo_data["results"]) == 0:
+            return None
+
+        lat = geo_data["results"][0]["latitude"]
+        lon = geo_data["results"][0]["longitude"]
+        with self.lock:
+            self.coordinates[key] = [lat, lon]
+            coordinates = dict(self.coordinates)
+        self.store.save(("geocode",), coordinates, time.time())
+        return lat, lon
+
 
 class WeatherData:
-    def __init__(self):
-        self.data = {}
+    def __init__(self, http, store: ResponseStore):
+        self.http = http
+        self.geocoder = GeocodeCache(http, store)
+        self.data = []
         self.lock = Lock()
         self.last_update = 0
 
-    def update_weather(self, location: str, use_fahrenheit: bool):
+    def update_weather(self, locations: List[str], use_fahrenheit: bool):
+        """Fetch the hourly series for every location in a single forecast request"""
         try:
-            geocode_url = f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1"
-            geo_response = requests.get(geocode_url, timeout=5)
-            geo_data = geo_response.json()
-
-            if "results" not in geo_data or len(geo_data["results"]) == 0:
-                return
-
-            lat = geo_data["results"][0]["latitude"]
-            lon = geo_data["results"][0]["longitude"]
+            found = []
+            for location in locations:
+                coordinates = self.geocoder.lookup(location)
+                if coordinates:
+                    found.append((location, coordinates))
+            if not found:
+                # Don't leave the previous location's weather on screen.
+                with self.lock:
+                    self.data = []
+                raise ValueError(f"No coordinates found for {', '.join(locations)}")
 
+            lats = ",".join(str(lat) for _, (lat, _) in found)
+            lons = ",".join(str(lon) for _, (_, lon) in found)
             temp_unit = "fahrenheit" if use_fahrenheit else "celsius"
-            weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code&temperature_unit={temp_unit}"
-            weather_response = requests.get(weather_url, timeout=5)
+            weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lats}&longitude={lons}&hourly=temperature_2m,weather_code&temperature_unit={temp_unit}&forecast_days={FORECAST_DAYS}&timeformat=unixtime"
+            weather_response = self.http.get(weather_url, timeout=5)
             weather_data = weather_response.json()
 
-            if "current" in weather_data:
-                temp = weather_data["current"]["temperature_2m"]
-                weather_code = weather_data["current"]["weather_code"]
-                condition = self._get_condition(weather_code)
-
+            # One location comes back as an object, several as a list in request order.
+            if not isinstance(weather_data, list):
+                weather_data = [weather_data]
+
+            data = []
+            for (location, _), result in zip(found, weather_data):
+                hourly = result.get("hourly")
+                if hourly and hourly.get("time"):
+                    data.append(
+                        HourlyForecast(
+                            location,
+                            "F" if use_fahrenheit else "C",
+                            hourly["time"][0],
+                            hourly["temperature_2m"],
+                            hourly["weather_code"],
+                        )
+                    )
+
+            if data:
                 with self.lock:
-                    self.data = {
-                        "temp": temp,
-                        "condition": condition,
-                        "unit": "F" if use_fahrenheit else "C",
-                    }
+                    self.data = data
                     self.last_update = time.time()
-        except Exception as e:
-            print(f"Error updating weather: {e}")
+        except Exception:
+            # Re-raised so the update job backs off to its retry interval.
+            logger.exception("Error updating weather")
+            raise
 
-    def _get_condition(self, code: int) -> str:
+    @staticmethod
+    def get_condition(code: int) -> str:
         if code == 0:
             return "Clear"
         elif code in [1, 2, 3]:
@@ -71,9 +181,9 @@ class WeatherData:
         else:
             return "Unknown"
 
-    def get_weather(self):
+    def get_weather(self) -> Optional[List[HourlyForecast]]:
         with self.lock:
-            return self.data.copy() if self.data else None
+            return list(self.data) if self.data else None
 
 
 class WeatherScene(Scene):
@@ -83,35 +193,64 @@ class WeatherScene(Scene):
 
         font_path = self.app_dir / "resources" / "7x13.bdf"
         self.font = Font(str(font_path))
-        self.weather_data = WeatherData()
-        self.update_thread = None
-        self.running = True
+        self.store = ResponseStore(self.app_dir)
+        self.weather_data = WeatherData(application_config.http, self.store)
         self.initialized = False
+        self.current_index = 0
+        self.last_switch = time.time()
+        self.show_forecast = self.config.get("display_mode", "Current") == "Forecast"
+        self.scroll_start = time.time()
+
+        self._load_stored_weather()
+        self.update_job = application_config.fetch_loop.schedule(
+            "WeatherUpdate", self._do_update, interval=FORECAST_REFRESH
+        )
 
-        self.start_updates()
+    def stop(self):
+        self.update_job.cancel()
 
-    def start_updates(self):
-        self.update_thread = Thread(target=self._update_loop, daemon=True)
-        self.update_thread.start()
+    def _locations(self) -> List[str]:
+        location = self.config.get("location", "New York")
+        return [location] + list(self.config.get("extra_locations") or [])
 
-    def update_now(self, new_config: Optional[Config] = None):
-        Thread(target=self._do_update, args=(new_config,), daemon=True).start()
+    def _store_key(self):
+        return (
+            "forecast",
+            self.config.get("temperature_unit", "Fahrenheit"),
+            *self._locations(),
+        )
 
-    def _do_update(self, new_config: Optional[Config] = None):
+    def _load_stored_weather(self):
+        """Show the last known weather until the first update comes back"""
+        stored = self.store.load(self._store_key())
+        if stored:
+            data, fetched_at = stored
+            with self.weather_data.lock:
+                self.weather_data.data = [HourlyForecast.from_dict(d) for d in data]
+                self.weather_data.last_update = fetched_at
+            self.initialized = True
+
+    def update_now(self, new_config: Optional[Config] = None):
         if new_config:
             self.config = new_config
-        location = self.config.get("location", "New York")
+            self.show_forecast = new_config.get("display_mode", "Current") == "Forecast"
+        self.update_job.wake()
+
+    def _do_update(self):
         use_fahrenheit = (
             self.config.get("temperature_unit", "Fahrenheit") == "Fahrenheit"
         )
-        self.weather_data.update_weather(location, use_fahrenheit)
-        self.initialized = True
-
-    def _update_loop(self):
-        self._do_update()
-        while self.running:
-            time.sleep(3600)
-            self._do_update()
+        last_update = self.weather_data.last_update
+        try:
+            self.weather_data.update_weather(self._locations(), use_fahrenheit)
+        finally:
+            self.initialized = True
+        if self.weather_data.last_update != last_update:
+            self.store.save(
+                self._store_key(),
+                [forecast.to_dict() for forecast in self.weather_data.get_weather()],
+                self.weather_data.last_update,
+            )
 
     def render(self, canvas) -> None:
         canvas.Clear()
@@ -124,17 +263,77 @@ class WeatherScene(Scene):
         canvas.Clear()
 
         if data:
-            temp = data["temp"]
-            condition = data["condition"]
-            unit = data["unit"]
-
-            temp_str = f"{temp:.0f}{unit}"
+            # The forecast view stays on one location, LEFT/RIGHT switches it.
+            if (
+                not self.show_forecast
+                and time.time() - self.last_switch > ROTATION_SECONDS
+            ):
+                self.current_index += 1
+                self.last_switch = time.time()
+            self.current_index %= len(data)
+            forecast = data[self.current_index]
+
+            if self.show_forecast:
+                self._render_forecast(canvas, forecast)
+                return
 
-            draw_text(canvas, self.font, 2, 12, Color(255, 255, 255), temp_str)
-            draw_text(canvas, self.font, 2, 24, Color(200, 200, 200), condition)
+            now = forecast.at(time.time())
+            if now is None:
+                draw_text(canvas, self.font, 2, 16, Color(255, 255, 0), "No data")
+                return
+            temp, code = now
+            temp_str = f"{temp:.0f}{forecast.unit}"
+            condition = WeatherData.get_condition(code)
+
+            if len(data) == 1:
+                draw_text(canvas, self.font, 2, 12, Color(255, 255, 255), temp_str)
+                draw_text(canvas, self.font, 2, 24, Color(200, 200, 200), condition)
+            else:
+                # Name the location when rotating through several.
+                name = forecast.location[:9]
+                draw_text(canvas, self.font, 2, 9, Color(200, 200, 200), name)
+                draw_text(canvas, self.font, 2, 20, Color(255, 255, 255), temp_str)
+                draw_text(canvas, self.font, 2, 31, Color(200, 200, 200), condition)
         else:
             draw_text(canvas, self.font, 2, 16, Color(255, 255, 0), "No data")
 
+    def _render_forecast(self, canvas, forecast: HourlyForecast):
+        """Scroll the coming hours past as hour / temperature / condition columns"""
+        first_hour = max(forecast.hour_index(time.time()), 0)
+        hours = min(FORECAST_HOURS, len(forecast.temps) - first_hour)
+        if hours <= 0:
+            draw_text(canvas, self.font, 2, 16, Color(255, 255, 0), "No data")
+            return
+
+        strip_width = hours * FORECAST_COLUMN_WIDTH
+        offset = int((time.time() - self.scroll_start) * FORECAST_SCROLL_SPEED) % strip_width
+
+        # Only the two or three columns on screen are drawn, wrapping back to the first hour.
+        column = offset // FORECAST_COLUMN_WIDTH
+        x = column * FORECAST_COLUMN_WIDTH - offset
+        while x < 64:
+            hour = first_hour + column % hours
+            label = time.strftime("%Hh", time.localtime(forecast.start + hour * 3600))
+            temp_str = f"{forecast.temps[hour]:.0f}{forecast.unit}"
+            condition = WeatherData.get_condition(int(forecast.codes[hour]))[:4]
+
+            draw_text(canvas, self.font, x + 1, 9, Color(200, 200, 200), label)
+            draw_text(canvas, self.font, x + 1, 20, Color(255, 255, 255), temp_str)
+            draw_text(canvas, self.font, x + 1, 31, Color(200, 200, 200), condition)
+            x += FORECAST_COLUMN_WIDTH
+            column += 1
+
+    def handle_input(self, input_type: InputType):
+        if input_type == InputType.ACCEPT:
+            self.show_forecast = not self.show_forecast
+            self.scroll_start = time.time()
+        elif input_type == InputType.RIGHT:
+            self.current_index += 1
+            self.last_switch = self.scroll_start = time.time()
+        elif input_type == InputType.LEFT:
+            self.current_index -= 1
+            self.last_switch = self.scroll_start = time.time()
+
 class App(Application):
     def __init__(self, application_config: ApplicationConfig, matrix):
         super().__init__(application_config, matrix)
@@ -142,7 +341,7 @@ class App(Application):
         self.scene = self.scenes["weather"]
 
     def cleanup(self):
-        self.scene.running = False
+        self.scene.stop()
 
     def get_framerate(self) -> int:
         return 10
@@ -151,7 +350,7 @@ class App(Application):
         self.scene.render(canvas)
 
     def _handle_input(self, input_type: InputType) -> Optional[InputResult]:
-        return
+        self.scene.handle_input(input_type)
 
     def handle_new_config(self, new_config: Config):
         self.scene.update_now(new_config)
\ No newline at end of file
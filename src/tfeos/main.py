@@ -4,7 +4,6 @@ import select
 import signal
 import sys
 import termios
-import time
 import tty
 from pathlib import Path
 from threading import Thread
@@ -14,11 +13,13 @@ import uvicorn
 
 from api.app import create_app
 from appkit.config import Config
+from appkit.fetch_loop import shared_fetch_loop
 from appkit.manager import Application, ApplicationManager
 from appkit.menu import AppMenuItem, AppMenuScene
 
 from .input import InputResult, InputType
 from .logging import LOG_FORMAT
+from .scheduler import FrameScheduler
 
 CURRENT_FILE = Path(__file__).resolve()
 SRC_DIR = CURRENT_FILE.parent.parent
@@ -41,6 +42,9 @@ class LEDMatrixOS:
         self.manager = ApplicationManager(apps_dir)
         self.manager.load_applications()
         self.current_framerate = 30
+        self.scheduler = FrameScheduler(self.current_framerate)
+        # Periodic data fetches for every app run as tasks on this one loop thread
+        self.fetch_loop = shared_fetch_loop()
 
         menu_items = []
         for app in self.manager.get_all_applications():
@@ -136,6 +140,7 @@ class LEDMatrixOS:
         tty.setcbreak(sys.stdin.fileno())
 
         while self.running:
+            self.scheduler.begin_frame()
             input_key = self.read_input()
 
             if self.active_app:
@@ -144,20 +149,23 @@ class LEDMatrixOS:
                     if input_result:
                         self.return_to_menu()
                         self.canvas.Clear()
+                        self.scheduler.reset()
                         continue
+                self.scheduler.set_framerate(self.active_app.get_framerate())
                 self.active_app.render(self.canvas)
-                sleep_time = 1.0 / self.active_app.get_framerate()
             else:
                 if input_key:
                     input_result = self.menu_scene.handle_input(input_key)
                     if input_result:
                         self.handle_menu_selection(input_result)
                         self.canvas.Clear()
+                        self.scheduler.reset()
                         continue
+                self.scheduler.set_framerate(self.current_framerate)
                 self.menu_scene.render(self.canvas)
-                sleep_time = 1.0 / self.current_framerate
+            self.scheduler.end_render()
             self.canvas = self.matrix.SwapOnVSync(self.canvas)
-            time.sleep(sleep_time)
+            self.scheduler.wait_for_deadline()
 
     def handle_menu_selection(self, app_name: str):
         app = self.manager.launch_application(app_name, self.matrix)
@@ -170,6 +178,14 @@ class LEDMatrixOS:
         self.current_framerate = 30
         logger.info("Returned to menu")
 
+    def get_frame_stats(self) -> dict:
+        stats = self.scheduler.get_stats()
+        stats["active_app"] = (
+            self.active_app.application_config.app_name if self.active_app else None
+        )
+        stats["fetch_jobs"] = self.fetch_loop.get_stats()["jobs"]
+        return stats
+
     def start(self, host: str = "0.0.0.0", port: int = 8000):
         logger.info(f"Loaded {len(self.manager.get_all_applications())} applications")
 
@@ -195,6 +211,9 @@ class LEDMatrixOS:
         def signal_handler(sig, frame):
             logger.info("Shutting down...")
             self.running = False
+            if self.active_app:
+                self.active_app.cleanup()
+            self.fetch_loop.stop()
             sys.exit(0)
 
         signal.signal(signal.SIGINT, signal_handler)
@@ -0,0 +1,98 @@
+import time
+from typing import Any, Dict, Optional
+
+# Weight given to the newest sample in the running averages
+EMA_WEIGHT = 0.1
+
+
+class FrameScheduler:
+    """Paces the core loop against absolute frame deadlines on the monotonic clock.
+
+    Each frame gets a deadline one frame period after the previous one, so time
+    spent rendering and swapping is subtracted from the sleep instead of being
+    added on top of it. When a frame overruns its deadline the scheduler drops
+    the whole periods it missed and starts a fresh deadline from the current
+    time rather than rendering a burst of frames to catch up.
+    """
+
+    def __init__(self, framerate: int = 30):
+        self.framerate = framerate
+        self.frame_period = 1.0 / framerate
+        self.next_deadline: Optional[float] = None
+        self.frame_start = 0.0
+        self.render_end = 0.0
+        self.last_frame_start: Optional[float] = None
+
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.skipped_frames = 0
+        self.avg_render_time = 0.0
+        self.avg_swap_time = 0.0
+        self.avg_frame_period = self.frame_period
+
+    def set_framerate(self, framerate: int):
+        if framerate == self.framerate:
+            return
+        self.framerate = framerate
+        self.frame_period = 1.0 / framerate
+        # Called between begin_frame and wait_for_deadline, so re-anchor the
+        # current frame's deadline rather than dropping it.
+        if self.next_deadline is not None:
+            self.next_deadline = self.frame_start + self.frame_period
+        self.last_frame_start = None
+
+    def reset(self):
+        """Drop the current deadline, e.g. after switching apps or clearing the canvas"""
+        self.next_deadline = None
+        self.last_frame_start = None
+
+    def begin_frame(self):
+        self.frame_start = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = self.frame_start + self.frame_period
+
+    def end_render(self):
+        self.render_end = time.monotonic()
+
+    def wait_for_deadline(self):
+        """Sleep until the current frame's deadline and schedule the next one"""
+        now = time.monotonic()
+        self._record(now)
+
+        deadline = self.next_deadline
+        if deadline is None:
+            # Reset mid-frame, there's nothing to wait for.
+            self.next_deadline = now + self.frame_period
+        elif now < deadline:
+            time.sleep(deadline - now)
+            self.next_deadline = deadline + self.frame_period
+        else:
+            self.missed_deadlines += 1
+            self.skipped_frames += int((now - deadline) // self.frame_period)
+            self.next_deadline = now + self.frame_period
+
+    def _record(self, now: float):
+        render_time = self.render_end - self.frame_start
+        swap_time = now - self.render_end
+        self.avg_render_time += EMA_WEIGHT * (render_time - self.avg_render_time)
+        self.avg_swap_time += EMA_WEIGHT * (swap_time - self.avg_swap_time)
+
+        if self.last_frame_start is not None:
+            period = self.frame_start - self.last_frame_start
+            self.avg_frame_period += EMA_WEIGHT * (period - self.avg_frame_period)
+        self.last_frame_start = self.frame_start
+        self.frames += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "target_fps": self.framerate,
+            "actual_fps": round(1.0 / self.avg_frame_period, 1)
+            if self.avg_frame_period
+            else 0.0,
+            "render_ms": round(self.avg_render_time * 1000, 2),
+            "swap_ms": round(self.avg_swap_time * 1000, 2),
+            "frame_budget_ms": round(self.frame_period * 1000, 2),
+            "frames": self.frames,
+            "missed_deadlines": self.missed_deadlines,
+            "skipped_frames": self.skipped_frames,
+        }
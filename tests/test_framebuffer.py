@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("RGBMatrixEmulator")
+
+from appkit.framebuffer import FrameBuffer
+
+
+def test_fill_defaults_to_the_whole_frame():
+    frame = FrameBuffer(8, 4)
+    frame.fill((1, 2, 3))
+
+    assert (frame.pixels == (1, 2, 3)).all()
+
+
+@pytest.mark.parametrize("size", [{"width": 0}, {"height": 0}])
+def test_empty_fill_draws_nothing(size):
+    frame = FrameBuffer(8, 4)
+    frame.fill((255, 255, 255), 2, 1, **size)
+
+    assert not frame.pixels.any()
+
+
+@pytest.mark.parametrize("size", [{"width": 0}, {"height": 0}])
+def test_empty_gradient_draws_nothing(size):
+    frame = FrameBuffer(8, 4)
+    frame.gradient((0, 0, 0), (255, 255, 255), x=2, y=1, **size)
+
+    assert not frame.pixels.any()
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("RGBMatrixEmulator")
+
+from appkit.menu import AppMenuItem, AppMenuScene
+
+
+class Canvas:
+    def SetImage(self, image, x=0, y=0, unsafe=True):
+        self.image = image
+
+
+def items(count, prefix="app"):
+    return [AppMenuItem(f"{prefix}{i}", f"{prefix}{i}", None) for i in range(count)]
+
+
+def test_new_app_list_rebuilds_pages():
+    scene = AppMenuScene(items(8))
+    scene.selected_index = 7
+    scene.render(Canvas())
+    assert len(scene.pages) == 2
+    assert set(scene.icon_cache) == {f"app{i}" for i in range(8)}
+
+    scene.apps = items(3, prefix="new")
+    assert scene.pages is None
+    assert scene.icon_cache == {}
+    assert scene.selected_index == 2
+
+    scene.render(Canvas())
+    assert len(scene.pages) == 1
+    assert set(scene.icon_cache) == {"new0", "new1", "new2"}
@@ -0,0 +1,28 @@
+from tfeos.scheduler import FrameScheduler
+
+
+def test_framerate_change_between_begin_frame_and_wait():
+    scheduler = FrameScheduler(30)
+    scheduler.begin_frame()
+    scheduler.end_render()
+    scheduler.wait_for_deadline()
+
+    # The core loop sets the app's framerate after begin_frame
+    scheduler.begin_frame()
+    scheduler.set_framerate(100)
+    scheduler.end_render()
+    scheduler.wait_for_deadline()
+
+    assert scheduler.next_deadline is not None
+    assert scheduler.frame_period == 0.01
+    assert scheduler.frames == 2
+
+
+def test_reset_between_begin_frame_and_wait_does_not_raise():
+    scheduler = FrameScheduler(100)
+    scheduler.begin_frame()
+    scheduler.reset()
+    scheduler.end_render()
+    scheduler.wait_for_deadline()
+
+    assert scheduler.next_deadline is not None
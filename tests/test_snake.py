@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("RGBMatrixEmulator")
+
+from applications.snake.app import run_headless
+
+
+@pytest.mark.parametrize("width,height", [(8, 4), (8, 6), (10, 10)])
+def test_autopilot_fills_the_board(width, height):
+    result = run_headless(seed=1, width=width, height=height)
+
+    assert result["won"]
+    assert not result["game_over"]
+    assert result["score"] == width * height - 3
+
+
+def test_autopilot_rejects_odd_height():
+    with pytest.raises(ValueError):
+        run_headless(seed=1, width=8, height=5)
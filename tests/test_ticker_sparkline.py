@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("RGBMatrixEmulator")
+
+from applications.ticker.app import (
+    HISTORY_LENGTH,
+    SPARKLINE_HEIGHT,
+    SPARKLINE_TOP,
+    TickerData,
+    TickerScene,
+)
+
+
+def build_sparkline(prices):
+    scene = TickerScene.__new__(TickerScene)
+    scene.ticker_data = TickerData(http=None, fetch_loop=None)
+    scene.ticker_data._history_for("AAPL").extend(range(len(prices)), prices)
+    scene._build_sparkline("AAPL")
+    return scene
+
+
+def test_sparkline_draws_the_whole_history():
+    # Climbs through the first half of the day and stays flat after it, so the
+    # last 64 samples alone would draw a flat line.
+    half = HISTORY_LENGTH // 2
+    scene = build_sparkline(list(range(half)) + [half] * half)
+
+    columns = {}
+    for x, y in scene.sparkline_pixels:
+        columns.setdefault(x, []).append(y)
+
+    bottom = SPARKLINE_TOP + SPARKLINE_HEIGHT - 1
+    assert sorted(columns) == list(range(64))
+    assert max(columns[0]) == bottom
+    assert min(columns[63]) == SPARKLINE_TOP
+    assert scene.sparkline_colour == (0, 255, 0)
+
+
+def test_short_history_is_right_aligned():
+    scene = build_sparkline([3, 2, 1])
+
+    assert sorted({x for x, _ in scene.sparkline_pixels}) == [61, 62, 63]
+    assert scene.sparkline_colour == (255, 0, 0)